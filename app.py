@@ -1,17 +1,60 @@
 import os
+import io
+import asyncio
 import re
 import time
 import random
+import threading
 import requests
-from flask import Flask, request, jsonify, render_template
+from requests.adapters import HTTPAdapter
+from flask import Flask, Response, request, jsonify, render_template, url_for
 from werkzeug.utils import secure_filename
 from PyPDF2 import PdfReader
 from bs4 import BeautifulSoup
 from flask_cors import CORS
 from urllib.parse import urljoin, quote_plus
 import logging
-from collections import Counter
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
 import json
+import bisect
+import contextvars
+import multiprocessing
+import functools
+import heapq
+import inspect
+import math
+import hashlib
+import queue
+import shutil
+import sqlite3
+import tempfile
+import uuid
+import weakref
+import zlib
+
+import pdf_worker
+
+# Faster HTML parsers are optional; BeautifulSoup's html.parser is the fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401 - only used as a BeautifulSoup tree builder
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Async HTTP client used by the async scrapers under asgi.py; without it they fetch on threads
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +67,140 @@ UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max file size
+BATCH_MAX_CANDIDATES = int(os.environ.get("BATCH_MAX_CANDIDATES", 50000))  # Candidates per /api/analyze/batch call
+UPLOAD_SPOOL_THRESHOLD = int(os.environ.get("UPLOAD_SPOOL_THRESHOLD", 2 * 1024 * 1024))  # Larger PDFs spool to a temp file
+
+# Concurrent scraping settings
+SCRAPE_DEADLINE_SECONDS = float(os.environ.get("SCRAPE_DEADLINE_SECONDS", 25))  # Overall budget per scrape; keep under the 30s worker/router timeouts
+PORTAL_MAX_CONCURRENCY = int(os.environ.get("PORTAL_MAX_CONCURRENCY", 2))  # Parallel queries per portal
+RANK_CANDIDATES_PER_PORTAL = int(os.environ.get("RANK_CANDIDATES_PER_PORTAL", 15))  # Jobs fetched per portal before ranking keeps the best
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get("NEAR_DUPLICATE_THRESHOLD", 0.7))  # Title similarity at which same-company jobs merge
+
+# Adaptive per-host rate limits (token bucket, additive increase / multiplicative decrease on 429)
+HOST_RATE_INITIAL = float(os.environ.get("HOST_RATE_INITIAL", 1.0))  # Requests per second each host starts at; 0 disables
+HOST_RATE_MIN = float(os.environ.get("HOST_RATE_MIN", 0.1))  # Floor after repeated throttling
+HOST_RATE_MAX = float(os.environ.get("HOST_RATE_MAX", 4.0))  # Ceiling reached while a host keeps answering
+HOST_BURST = float(os.environ.get("HOST_BURST", 2))  # Requests a quiet host may take back to back
+HOST_MAX_WAIT_SECONDS = float(os.environ.get("HOST_MAX_WAIT_SECONDS", 30))  # Give up instead of queueing longer
+
+# Per-portal circuit breakers
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", 3))  # Consecutive failed fetches before a portal is skipped
+CIRCUIT_RESET_SECONDS = float(os.environ.get("CIRCUIT_RESET_SECONDS", 60))  # How long a portal is skipped before one probe request
+
+# Pooled HTTP connection settings (one keep-alive session per portal host)
+HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", 4))  # Distinct hosts cached per session
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 10))  # Keep-alive connections kept per host
+
+# Fetch backend: "live", "record" (live + save responses) or "replay" (serve saved responses only)
+FETCH_MODE = os.environ.get("FETCH_MODE", "live").lower()
+FETCH_FIXTURES_DIR = os.environ.get("FETCH_FIXTURES_DIR", os.path.join("fixtures", "http"))
+FETCH_LATENCY = os.environ.get("FETCH_LATENCY", "")  # Added delay in seconds, e.g. "0.3" or "0.1-0.8"
+FETCH_429_RATE = float(os.environ.get("FETCH_429_RATE", 0))  # Share of fetches answered with HTTP 429
+FETCH_TIMEOUT_RATE = float(os.environ.get("FETCH_TIMEOUT_RATE", 0))  # Share of fetches that time out
+
+# HTML parser for portal pages: "auto" (selectolax, then lxml, then html.parser) or one of those names
+HTML_PARSER = os.environ.get("HTML_PARSER", "auto").lower()
+
+# Scraped job listing cache settings
+JOB_CACHE_TTL_SECONDS = float(os.environ.get("JOB_CACHE_TTL_SECONDS", 900))  # Fresh for 15 minutes
+JOB_CACHE_STALE_SECONDS = float(os.environ.get("JOB_CACHE_STALE_SECONDS", 3600))  # Then served stale while refreshing
+JOB_CACHE_MAX_ENTRIES = int(os.environ.get("JOB_CACHE_MAX_ENTRIES", 1024))  # LRU bound on (portal, query) entries
+JOB_CACHE_DB = os.environ.get("JOB_CACHE_DB", "job_cache.sqlite3")  # Shared across workers; empty disables
+
+# Local job index filled by crawler.py and searched before scraping live
+JOB_INDEX_DB = os.environ.get("JOB_INDEX_DB", "job_index.sqlite3")  # Shared with the crawler process; empty disables
+JOB_INDEX_MAX_AGE_SECONDS = float(os.environ.get("JOB_INDEX_MAX_AGE_SECONDS", 2 * 24 * 3600))  # Older listings are ignored and purged
+JOB_INDEX_MIN_RESULTS = int(os.environ.get("JOB_INDEX_MIN_RESULTS", 5))  # Fewer indexed matches falls back to live scraping
+CRAWL_IN_WEB = os.environ.get("CRAWL_IN_WEB", "false").lower() == "true"  # Start the crawler in a gunicorn worker (gunicorn.conf.py)
+CRAWL_INTERVAL_SECONDS = float(os.environ.get("CRAWL_INTERVAL_SECONDS", 6 * 3600))  # Between the starts of in-web crawl passes
+CRAWL_HOST_RATE = float(os.environ.get("CRAWL_HOST_RATE", 0.5))  # Crawler's own requests per second per host, apart from users'
+
+# Background scrape jobs started by /upload
+SCRAPE_JOB_WORKERS = int(os.environ.get("SCRAPE_JOB_WORKERS", 8))  # Concurrent background scrapes per worker
+SCRAPE_JOB_TTL_SECONDS = float(os.environ.get("SCRAPE_JOB_TTL_SECONDS", 3600))  # How long results stay pollable
+
+# Parsed resumes cached by content hash
+RESUME_CACHE_MAX_ENTRIES = int(os.environ.get("RESUME_CACHE_MAX_ENTRIES", 256))
+
+# PDF text extraction settings
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", 10))  # Pages beyond this are ignored
+PDF_PAGE_TIMEOUT = float(os.environ.get("PDF_PAGE_TIMEOUT", 5))  # Seconds budgeted per page
+PDF_EXTRACT_PROCESSES = int(os.environ.get("PDF_EXTRACT_PROCESSES", min(4, os.cpu_count() or 1)))  # Extraction processes per worker; 0 extracts in-thread
+
+# -----------------------------
+# Latency Metrics
+# -----------------------------
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class LatencyHistogram:
+    """Thread-safe Prometheus-style latency histogram with a single label"""
+    
+    def __init__(self, name, help_text, label_name, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        self.buckets = buckets
+        self._series = {}  # label value -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+    
+    def observe(self, label, seconds):
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [0] * len(self.buckets) + [0.0, 0]
+            index = bisect.bisect_left(self.buckets, seconds)
+            if index < len(self.buckets):  # Slower than the last bucket only counts towards +Inf
+                series[index] += 1
+            series[-2] += seconds
+            series[-1] += 1
+    
+    @contextmanager
+    def time(self, label):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(label, time.perf_counter() - started)
+    
+    def timed(self, label):
+        """Decorator recording how long each call of the function takes"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def render(self):
+        with self._lock:
+            series = {label: list(values) for label, values in self._series.items()}
+        
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label, values in sorted(series.items()):
+            label_pair = f'{self.label_name}="{_escape_label(label)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_pair},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_pair},le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{label_pair}}} {values[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{label_pair}}} {values[-1]}")
+        return lines
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+STAGE_SECONDS = LatencyHistogram(
+    "resume_pipeline_stage_seconds", "Time spent in each resume processing stage", "stage")
+PORTAL_SCRAPE_SECONDS = LatencyHistogram(
+    "portal_scrape_seconds", "Time to scrape one job portal for a request", "portal")
+HTTP_FETCH_SECONDS = LatencyHistogram(
+    "http_fetch_seconds", "Time for one outbound HTTP fetch attempt", "host")
+
+# Requests currently being handled by this worker
+_in_flight_requests = 0
+_in_flight_lock = threading.Lock()
 
 # Comprehensive skills database - extracted from resume content
 PROGRAMMING_LANGUAGES = [
@@ -73,6 +250,7 @@ OTHER_SKILLS = [
 # Combine all skills
 ALL_SKILLS = (PROGRAMMING_LANGUAGES + WEB_TECHNOLOGIES + DATABASES + 
               DATA_SCIENCE_AI + CLOUD_DEVOPS + MOBILE_TECHNOLOGIES + OTHER_SKILLS)
+ALL_SKILLS_SET = frozenset(ALL_SKILLS)
 
 # User agents to rotate
 USER_AGENTS = [
@@ -96,125 +274,1202 @@ def get_random_headers():
         "Pragma": "no-cache"
     }
 
-def safe_request(url, max_retries=3):
-    """Make safe HTTP requests with proper error handling"""
+def _time_left(deadline):
+    """Seconds remaining until a time.monotonic() deadline (None means no deadline)"""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+class ScrapeDeadline(float):
+    """A time.monotonic() deadline that also collects the hosts given up on for lack of time"""
+    
+    def __new__(cls, value):
+        deadline = super().__new__(cls, value)
+        # Hosts whose next request didn't fit the time left; their portals count as
+        # truncated even though they returned before the deadline
+        deadline.cut_short = set()
+        return deadline
+
+def _cut_short(deadline, url):
+    if isinstance(deadline, ScrapeDeadline):
+        deadline.cut_short.add(urlparse(url).netloc)
+
+def _portal_truncated(portal, deadline):
+    """Whether a finished portal stopped early because of the scrape's deadline"""
+    return _time_left(deadline) == 0 or PORTAL_HOSTS.get(portal) in getattr(deadline, "cut_short", ())
+
+class HostRateLimiter:
+    """Token bucket per host whose rate adapts to how the host responds"""
+    
+    def __init__(self, initial_rate, min_rate, max_rate, burst, increase=0.1, decrease=0.5):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        # Successes add increase to the rate; a 429/503 multiplies it by decrease
+        self.increase = increase
+        self.decrease = decrease
+        self._hosts = {}
+        self._lock = threading.Lock()
+    
+    def _bucket(self, host, now):
+        bucket = self._hosts.get(host)
+        if bucket is None:
+            bucket = self._hosts[host] = {
+                "rate": self.initial_rate, "tokens": self.burst, "updated": now,
+                "blocked_until": 0.0, "throttled": 0
+            }
+        # Refill for the time since the last call
+        bucket["tokens"] = min(self.burst, bucket["tokens"] + (now - bucket["updated"]) * bucket["rate"])
+        bucket["updated"] = now
+        return bucket
+    
+    def reserve(self, url, max_wait=None):
+        """Take a slot on url's host and return the seconds to wait before sending, or None if over max_wait"""
+        if self.initial_rate <= 0:
+            return 0.0
+        
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            delay = max(0.0, bucket["blocked_until"] - now)
+            if bucket["tokens"] < 1:
+                delay = max(delay, (1 - bucket["tokens"]) / bucket["rate"])
+            if max_wait is not None and delay > max_wait:
+                return None
+            # Reserve the token now so concurrent callers queue up behind us
+            bucket["tokens"] -= 1
+        return delay
+    
+    def acquire(self, url, max_wait=None):
+        """Wait for a request slot on url's host; False if that would take longer than max_wait"""
+        delay = self.reserve(url, max_wait)
+        if delay is None:
+            return False
+        # Sleep outside the lock so other hosts are not held up
+        if delay > 0:
+            time.sleep(delay)
+        return True
+    
+    def release(self, url):
+        """Give back a slot taken by reserve() that was never used"""
+        if self.initial_rate <= 0:
+            return
+        with self._lock:
+            bucket = self._bucket(urlparse(url).netloc, time.monotonic())
+            bucket["tokens"] = min(self.burst, bucket["tokens"] + 1)
+    
+    def succeeded(self, url):
+        with self._lock:
+            bucket = self._bucket(urlparse(url).netloc, time.monotonic())
+            bucket["rate"] = min(self.max_rate, bucket["rate"] + self.increase)
+    
+    def throttled(self, url, retry_after=None):
+        """Back off after a 429/503, blocking the host for retry_after seconds when given"""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            bucket["rate"] = max(self.min_rate, bucket["rate"] * self.decrease)
+            bucket["tokens"] = min(bucket["tokens"], 0.0)
+            bucket["throttled"] += 1
+            if retry_after:
+                bucket["blocked_until"] = max(bucket["blocked_until"], now + retry_after)
+        logger.warning(f"{host} is throttling us; rate now {bucket['rate']:.2f}/s" + (f", retrying after {retry_after:.1f}s" if retry_after else ""))
+    
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            return {
+                host: {
+                    "rate_per_s": round(bucket["rate"], 3),
+                    "blocked_for_s": round(max(0.0, bucket["blocked_until"] - now), 1),
+                    "throttled": bucket["throttled"]
+                }
+                for host, bucket in sorted(self._hosts.items())
+            }
+
+HOST_RATE_LIMITER = HostRateLimiter(HOST_RATE_INITIAL, HOST_RATE_MIN, HOST_RATE_MAX, HOST_BURST)
+
+class CircuitBreaker:
+    """Stops calling a portal after repeated failures and probes it again later"""
+    
+    def __init__(self, name, failure_threshold, reset_seconds):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        # "open" refuses requests for reset_seconds, then "half_open" lets one probe
+        # through, whose success closes the breaker and failure re-opens it
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    def is_open(self):
+        """True while requests would be refused (does not claim the half-open probe)"""
+        with self._lock:
+            if self.state == "open":
+                return time.monotonic() - self.opened_at < self.reset_seconds
+            return self.state == "half_open" and self._probing
+    
+    def allow(self):
+        """Whether a request may go out now; in half-open state only the first caller probes"""
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    return False
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open":
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logger.info(f"{self.name} recovered, closing circuit")
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                    logger.warning(f"{self.name} failing ({self.failures} in a row), skipping it for {self.reset_seconds:.0f}s")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probing = False
+    
+    def release(self):
+        """Give back a half-open probe that ended without reaching the portal (e.g. deadline hit)"""
+        with self._lock:
+            self._probing = False
+    
+    def stats(self):
+        with self._lock:
+            retry_in = self.reset_seconds - (time.monotonic() - self.opened_at) if self.state == "open" else 0.0
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_in_s": round(max(0.0, retry_in), 1),
+                "trips": self.trips
+            }
+
+# Each portal is served from one host, so its breaker is found from the request URL
+PORTAL_HOSTS = {
+    "Internshala": "internshala.com",
+    "Naukri": "www.naukri.com",
+    "Indeed": "in.indeed.com"
+}
+PORTAL_BREAKERS = {
+    host: CircuitBreaker(portal, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+    for portal, host in PORTAL_HOSTS.items()
+}
+
+# (rate limiter, {host: breaker}) the current scrape runs under, when not the shared ones
+_scrape_limits = contextvars.ContextVar("scrape_limits", default=None)
+
+def current_limits():
+    limits = _scrape_limits.get()
+    return limits if limits is not None else (HOST_RATE_LIMITER, PORTAL_BREAKERS)
+
+@contextmanager
+def scrape_limits(limiter, breakers):
+    """Run the scrapes started inside the block against their own rate limiter and breakers"""
+    token = _scrape_limits.set((limiter, breakers))
+    try:
+        yield
+    finally:
+        _scrape_limits.reset(token)
+
+def _submit_in_context(executor, fn, *args):
+    # Executor threads don't inherit context variables, so the scrape's limits are carried over
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+def portal_breaker(portal):
+    return current_limits()[1].get(PORTAL_HOSTS.get(portal))
+
+# Responses meaning the portal is blocking or failing us, as opposed to e.g. a 404 for one URL pattern
+BLOCKING_STATUS_CODES = {403, 429, 500, 502, 503, 504}
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Keep-alive sessions per host, shared by all threads in this worker
+_http_sessions = {}
+_http_sessions_lock = threading.Lock()
+
+def get_http_session(url):
+    """Return the pooled keep-alive session for this URL's host"""
+    host = urlparse(url).netloc
+    with _http_sessions_lock:
+        session = _http_sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_sessions[host] = session
+    return session
+
+def get_http_pool_stats():
+    """Report connections opened vs reused for every pooled host session"""
+    with _http_sessions_lock:
+        sessions = dict(_http_sessions)
+    
+    stats = {}
+    for host, session in sessions.items():
+        opened = 0
+        sent = 0
+        # The same adapter is mounted for http:// and https://
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                sent += pool.num_requests
+        stats[host] = {
+            "requests": sent,
+            "connections_opened": opened,
+            "connections_reused": max(sent - opened, 0)
+        }
+    return stats
+
+# -----------------------------
+# Pluggable Fetch Backends
+# -----------------------------
+class FetchedResponse:
+    """Minimal stand-in for requests.Response used by replayed and injected responses"""
+    
+    def __init__(self, url, status_code, content=b"", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+    
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+# One pooled httpx client per event loop (clients can't be shared across loops)
+_async_http_clients = weakref.WeakKeyDictionary()
+
+def get_async_http_client():
+    """Return the keep-alive httpx client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None:
+        client = _async_http_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAXSIZE * len(PORTAL_HOSTS),
+                max_keepalive_connections=HTTP_POOL_MAXSIZE * len(PORTAL_HOSTS)
+            )
+        )
+    return client
+
+async def close_async_http_client():
+    """Close the running loop's httpx client, e.g. when the ASGI server shuts down"""
+    client = _async_http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+def run_async(coro):
+    """asyncio.run(coro) for scripts, closing the loop's httpx client before the loop goes away"""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_async_http_client()
+    return asyncio.run(main())
+
+class LiveFetcher:
+    """Fetch over the network through the pooled per-host sessions"""
+    
+    def get(self, url, **kwargs):
+        return get_http_session(url).get(url, **kwargs)
+    
+    async def aget(self, url, headers=None, timeout=None, allow_redirects=True, **kwargs):
+        if httpx is None:
+            return await asyncio.to_thread(
+                self.get, url, headers=headers, timeout=timeout, allow_redirects=allow_redirects, **kwargs
+            )
+        return await get_async_http_client().get(
+            url, headers=headers, timeout=timeout, follow_redirects=allow_redirects
+        )
+
+class RecordingFetcher:
+    """Fetch live and save every response under directory/<host>/ for later replay"""
+    
+    def __init__(self, directory, inner=None):
+        self.directory = directory
+        self.inner = inner or LiveFetcher()
+    
+    def get(self, url, **kwargs):
+        response = self.inner.get(url, **kwargs)
+        self._record(url, response)
+        return response
+    
+    async def aget(self, url, **kwargs):
+        response = await _fetch_async(self.inner, url, **kwargs)
+        self._record(url, response)
+        return response
+    
+    def _record(self, url, response):
+        try:
+            base = fixture_path(self.directory, url)
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            with open(base + ".html", "wb") as f:
+                f.write(response.content)
+            with open(base + ".json", "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": url,
+                    "status_code": response.status_code,
+                    "headers": {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "retry-after")}
+                }, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not record response for {url}: {e}")
+
+class ReplayFetcher:
+    """Serve responses saved by RecordingFetcher without touching the network
+    
+    URLs that were never recorded fall back to directory/<host>/default.html when
+    present, so load tests can use any skills; otherwise they get a 404.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+    
+    def get(self, url, **kwargs):
+        base = fixture_path(self.directory, url)
+        meta = {"status_code": 200, "headers": {}}
+        if os.path.exists(base + ".json"):
+            with open(base + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+        if not os.path.exists(base + ".html"):
+            base = os.path.join(self.directory, urlparse(url).netloc, "default")
+        if not os.path.exists(base + ".html"):
+            return FetchedResponse(url, 404)
+        with open(base + ".html", "rb") as f:
+            return FetchedResponse(url, meta["status_code"], f.read(), meta.get("headers"))
+
+class FaultInjectingFetcher:
+    """Wrap a fetcher with artificial latency, HTTP 429s and timeouts for load testing"""
+    
+    def __init__(self, inner, latency=(0.0, 0.0), rate_429=0.0, timeout_rate=0.0):
+        self.inner = inner
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.timeout_rate = timeout_rate
+    
+    def get(self, url, **kwargs):
+        delay = random.uniform(*self.latency)
+        if delay:
+            time.sleep(delay)
+        return self._inject(url) or self.inner.get(url, **kwargs)
+    
+    async def aget(self, url, **kwargs):
+        delay = random.uniform(*self.latency)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._inject(url) or await _fetch_async(self.inner, url, **kwargs)
+    
+    def _inject(self, url):
+        roll = random.random()
+        if roll < self.timeout_rate:
+            raise requests.exceptions.Timeout(f"Injected timeout for {url}")
+        if roll < self.timeout_rate + self.rate_429:
+            return FetchedResponse(url, 429, headers={"Retry-After": "1"})
+        return None
+
+async def _fetch_async(backend, url, **kwargs):
+    """Fetch through a backend's aget when it has one, otherwise its blocking get on a thread"""
+    if hasattr(backend, "aget"):
+        return await backend.aget(url, **kwargs)
+    return await asyncio.to_thread(backend.get, url, **kwargs)
+
+def fixture_path(directory, url):
+    """Path (without extension) where the response for url is recorded"""
+    return os.path.join(directory, urlparse(url).netloc, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16])
+
+def _parse_latency(value):
+    """Parse "0.3" or "0.1-0.8" into a (low, high) range in seconds"""
+    if not value:
+        return 0.0, 0.0
+    low, _, high = value.partition("-")
+    return float(low), float(high or low)
+
+def build_fetch_backend(mode, directory, latency="", rate_429=0.0, timeout_rate=0.0):
+    """Create the fetch backend for a mode, wrapped with fault injection when configured"""
+    if mode == "replay":
+        backend = ReplayFetcher(directory)
+    elif mode == "record":
+        backend = RecordingFetcher(directory)
+    elif mode == "live":
+        backend = LiveFetcher()
+    else:
+        raise ValueError(f"Unknown fetch mode: {mode}")
+    
+    latency = _parse_latency(latency)
+    if latency[1] or rate_429 or timeout_rate:
+        backend = FaultInjectingFetcher(backend, latency, rate_429, timeout_rate)
+    return backend
+
+FETCH_BACKEND = build_fetch_backend(FETCH_MODE, FETCH_FIXTURES_DIR, FETCH_LATENCY, FETCH_429_RATE, FETCH_TIMEOUT_RATE)
+if FETCH_MODE != "live":
+    logger.info(f"Fetch backend: {FETCH_MODE} ({FETCH_FIXTURES_DIR})")
+
+def set_fetch_backend(backend):
+    """Swap the backend used by safe_request (e.g. a ReplayFetcher in tests or benchmarks)"""
+    global FETCH_BACKEND
+    FETCH_BACKEND = backend
+
+def _fetch_timeout(deadline):
+    """Per-attempt timeout, cut to the time left before a deadline"""
+    time_left = _time_left(deadline)
+    return 20 if time_left is None else max(min(20, time_left), 0.1)
+
+def _record_response(url, response, breaker, limiter):
+    """Feed a response into the rate limiter and breaker; True if it suggests the portal is down or blocking us"""
+    if response.status_code == 200:
+        limiter.succeeded(url)
+        if breaker:
+            breaker.record_success()
+    elif response.status_code in (429, 503):
+        # The limiter makes the next attempt (and every other thread) wait as long as needed
+        limiter.throttled(url, parse_retry_after(response.headers.get("Retry-After")))
+    else:
+        logger.warning(f"HTTP {response.status_code} for {url}")
+    return response.status_code in BLOCKING_STATUS_CODES
+
+def _settle_breaker(breaker, deadline, portal_failing):
+    """Record the outcome of a request that gave up without a 200
+    
+    portal_failing is None when no attempt reached the portal.
+    """
+    if not breaker:
+        return
+    if portal_failing is None or (deadline is not None and _time_left(deadline) == 0):
+        # Never sent, or cut short by the caller's budget; says nothing about the portal
+        breaker.release()
+    elif portal_failing:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+def safe_request(url, max_retries=3, deadline=None):
+    """Make safe HTTP requests with proper error handling
+    
+    With a time.monotonic() deadline, waits and timeouts are cut to the time left
+    and no attempt starts once it has passed.
+    """
+    limiter, breakers = current_limits()
+    breaker = breakers.get(urlparse(url).netloc)
+    if breaker and not breaker.allow():
+        logger.info(f"Skipping {url}: {breaker.name} circuit is open")
+        return None
+    
+    # Whether the last attempt suggests the portal itself is down or blocking us (None: not contacted yet)
+    portal_failing = None
     for attempt in range(max_retries):
+        time_left = _time_left(deadline)
+        if time_left == 0:
+            break
+        max_wait = HOST_MAX_WAIT_SECONDS if time_left is None else min(HOST_MAX_WAIT_SECONDS, time_left)
+        if not limiter.acquire(url, max_wait=max_wait):
+            if max_wait == HOST_MAX_WAIT_SECONDS:
+                # Our own queue is too long; that alone says nothing about the portal
+                logger.warning(f"Skipping {url}: host is rate limited for longer than {HOST_MAX_WAIT_SECONDS:.0f}s")
+            else:
+                _cut_short(deadline, url)
+            break
+        
         try:
             headers = get_random_headers()
-            response = requests.get(
-                url, 
-                headers=headers, 
-                timeout=20, 
-                allow_redirects=True,
-                verify=True
-            )
+            with HTTP_FETCH_SECONDS.time(urlparse(url).netloc):
+                response = FETCH_BACKEND.get(
+                    url, 
+                    headers=headers, 
+                    timeout=_fetch_timeout(deadline), 
+                    allow_redirects=True,
+                    verify=True
+                )
             
+            portal_failing = _record_response(url, response, breaker, limiter)
             if response.status_code == 200:
                 return response
-            elif response.status_code == 429:
-                wait_time = random.uniform(3, 8) * (attempt + 1)
-                logger.warning(f"Rate limited, waiting {wait_time:.1f}s")
-                time.sleep(wait_time)
-            else:
-                logger.warning(f"HTTP {response.status_code} for {url}")
                 
         except requests.exceptions.RequestException as e:
+            portal_failing = True
             logger.warning(f"Request failed (attempt {attempt + 1}): {str(e)}")
-            if attempt < max_retries - 1:
-                time.sleep(random.uniform(2, 5))
     
+    _settle_breaker(breaker, deadline, portal_failing)
     return None
 
-# -----------------------------
-# Enhanced Skills Extraction from Resume
-# -----------------------------
-def extract_skills_from_resume(file_path):
-    """Extract technical skills directly from resume PDF content"""
-    logger.info("Starting skill extraction from resume...")
+# Transport errors from either HTTP client
+FETCH_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+async def safe_request_async(url, max_retries=3, deadline=None):
+    """safe_request for the event loop: waits with asyncio.sleep and fetches through the backend's aget
     
-    # Extract text from PDF
-    text = ""
+    Shares the rate limiter and circuit breakers with the threaded scrapers.
+    """
+    limiter, breakers = current_limits()
+    breaker = breakers.get(urlparse(url).netloc)
+    if breaker and not breaker.allow():
+        logger.info(f"Skipping {url}: {breaker.name} circuit is open")
+        return None
+    
+    portal_failing = None
     try:
-        pdf_reader = PdfReader(file_path)
-        for page_num, page in enumerate(pdf_reader.pages):
+        for attempt in range(max_retries):
+            time_left = _time_left(deadline)
+            if time_left == 0:
+                break
+            max_wait = HOST_MAX_WAIT_SECONDS if time_left is None else min(HOST_MAX_WAIT_SECONDS, time_left)
+            delay = limiter.reserve(url, max_wait=max_wait)
+            if delay is None:
+                if max_wait == HOST_MAX_WAIT_SECONDS:
+                    # Our own queue is too long; that alone says nothing about the portal
+                    logger.warning(f"Skipping {url}: host is rate limited for longer than {HOST_MAX_WAIT_SECONDS:.0f}s")
+                else:
+                    _cut_short(deadline, url)
+                break
+            if delay > 0:
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    # Cancelled before sending; the reserved slot goes back to the host
+                    limiter.release(url)
+                    raise
+            
             try:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted + "\n"
-            except Exception as e:
-                logger.warning(f"Error extracting page {page_num}: {e}")
-                continue
-    except Exception as e:
-        logger.error(f"Error reading PDF: {e}")
-        return []
+                with HTTP_FETCH_SECONDS.time(urlparse(url).netloc):
+                    response = await _fetch_async(
+                        FETCH_BACKEND,
+                        url,
+                        headers=get_random_headers(),
+                        timeout=_fetch_timeout(deadline),
+                        allow_redirects=True,
+                        verify=True
+                    )
+                
+                portal_failing = _record_response(url, response, breaker, limiter)
+                if response.status_code == 200:
+                    return response
+                    
+            except FETCH_ERRORS as e:
+                portal_failing = True
+                logger.warning(f"Request failed (attempt {attempt + 1}): {str(e)}")
+    except asyncio.CancelledError:
+        # Abandoned by the caller (deadline or enough jobs found); free a half-open probe
+        if breaker:
+            breaker.release()
+        raise
     
-    if not text.strip():
-        logger.error("No text extracted from PDF")
-        return []
+    _settle_breaker(breaker, deadline, portal_failing)
+    return None
+
+# -----------------------------
+# HTML Parsing
+# -----------------------------
+class LexborNode:
+    """BeautifulSoup-style view (select, select_one, get_text, get) over a selectolax node"""
     
-    logger.info(f"Extracted {len(text)} characters from resume")
+    __slots__ = ("node",)
     
-    # Clean and normalize text
-    text = re.sub(r'\s+', ' ', text.strip())
-    text_lower = text.lower()
+    def __init__(self, node):
+        self.node = node
     
-    # Find skills with multiple matching patterns
-    found_skills = []
-    skill_matches = {}
+    def select(self, selector, limit=None):
+        nodes = self.node.css(selector)
+        return [LexborNode(node) for node in (nodes[:limit] if limit else nodes)]
+    
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return LexborNode(node) if node is not None else None
+    
+    def get_text(self, strip=False):
+        return self.node.text(strip=strip)
+    
+    def get(self, name, default=None):
+        value = self.node.attributes.get(name)
+        return default if value is None else value
+    
+    def __getitem__(self, name):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+def _resolve_html_parser(name):
+    """Pick the parser backend, falling back when the requested one is not installed"""
+    available = {
+        "selectolax": LexborHTMLParser is not None,
+        "lxml": LXML_AVAILABLE,
+        "html.parser": True
+    }
+    if name == "auto":
+        return next(backend for backend, ok in available.items() if ok)
+    if name not in available:
+        raise ValueError(f"Unknown HTML parser: {name}")
+    if not available[name]:
+        logger.warning(f"HTML parser '{name}' is not installed, using html.parser")
+        return "html.parser"
+    return name
+
+HTML_PARSER_BACKEND = _resolve_html_parser(HTML_PARSER)
+
+def parse_html(content):
+    """Parse a fetched page into a tree supporting select/select_one"""
+    if HTML_PARSER_BACKEND == "selectolax":
+        return LexborNode(LexborHTMLParser(content))
+    return BeautifulSoup(content, HTML_PARSER_BACKEND)
+
+# Last-resort selectors that match almost any page (and nested elements within it);
+# a match on one of them says nothing about the portal's current markup
+BROAD_SELECTORS = frozenset({
+    'div[class*="job"]',
+    'div[id*="internship"]',
+    '.text-muted',
+    'h3, h4, .profile, .heading_4_5'
+})
+
+class SelectorMemory:
+    """Remembers which fallback selector last matched, per portal and field"""
+    
+    def __init__(self):
+        self._preferred = {}
+    
+    def ordered(self, portal, field, selectors):
+        preferred = self._preferred.get((portal, field))
+        if preferred is None or preferred == selectors[0] or preferred not in selectors:
+            return selectors
+        # The first choice still goes first, so the memory follows markup that changes back
+        return [selectors[0], preferred] + [selector for selector in selectors[1:] if selector != preferred]
+    
+    def remember(self, portal, field, selector):
+        # A catch-all would be tried ahead of the specific selectors on every later page
+        if selector in BROAD_SELECTORS:
+            self._preferred.pop((portal, field), None)
+            return
+        self._preferred[(portal, field)] = selector
+    
+    def clear(self):
+        self._preferred.clear()
+    
+    def stats(self):
+        return {f"{portal}.{field}": selector for (portal, field), selector in sorted(self._preferred.items())}
+
+SELECTOR_MEMORY = SelectorMemory()
+
+def select_cards(soup, portal, selectors, limit):
+    """Return (selector, cards) for the first selector that finds any job cards"""
+    for selector in SELECTOR_MEMORY.ordered(portal, "cards", selectors):
+        cards = soup.select(selector, limit=limit)
+        if cards:
+            SELECTOR_MEMORY.remember(portal, "cards", selector)
+            return selector, cards
+    return None, []
+
+def select_field(card, portal, field, selectors, extract):
+    """Return extract(element) for the first selector yielding a non-empty value"""
+    for selector in SELECTOR_MEMORY.ordered(portal, field, selectors):
+        elem = card.select_one(selector)
+        if elem is None:
+            continue
+        value = extract(elem)
+        if value:
+            SELECTOR_MEMORY.remember(portal, field, selector)
+            return value
+    return None
+
+def element_text(elem):
+    return elem.get_text(strip=True)
+
+def absolute_link(base_url):
+    """Build an extractor turning an element's href into an absolute link on base_url"""
+    def extract(elem):
+        href = elem.get('href')
+        if not href:
+            return None
+        if href.startswith('/'):
+            return f"{base_url}{href}"
+        if href.startswith('http'):
+            return href
+        return None
+    return extract
+
+# -----------------------------
+# Precompiled Skill Matcher
+# -----------------------------
+# Common abbreviations for skills (full name -> abbreviations)
+SKILL_ABBREVIATIONS = {
+    'javascript': ['js'],
+    'typescript': ['ts'],
+    'machine learning': ['ml'],
+    'artificial intelligence': ['ai'],
+    'user interface': ['ui'],
+    'user experience': ['ux'],
+    'application programming interface': ['api'],
+    'structured query language': ['sql'],
+}
+
+def skill_variations(skill_lower):
+    """Handle variations (e.g., "Node.js" vs "NodeJS")"""
+    variations = []
+    if '.' in skill_lower:
+        variations.append(skill_lower.replace('.', ''))
+    if ' ' in skill_lower:
+        variations.append(skill_lower.replace(' ', ''))
+    if '-' in skill_lower:
+        variations.append(skill_lower.replace('-', ''))
+    return variations
+
+def _build_trie_pattern(words):
+    """Build a trie-shaped regex so each text position is matched in O(pattern length)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Greedy optional group prefers the longest pattern at each position
+            body = '(?:' + body + ')?'
+        return body
     
+    return render(trie)
+
+def _build_skill_matcher():
+    """Compile all skills and their variations into one matcher"""
+    rules = {}
     for skill in ALL_SKILLS:
         skill_lower = skill.lower()
+        if skill_lower in rules:
+            continue
+        
+        rules[skill_lower] = {
+            "skill": skill,
+            "variations": skill_variations(skill_lower),
+            "abbreviations": SKILL_ABBREVIATIONS.get(skill_lower, [])
+        }
+    
+    patterns = set()
+    for skill_lower, rule in rules.items():
+        patterns.add(skill_lower)
+        patterns.update(rule["variations"])
+    
+    # A zero-width lookahead reports the longest pattern starting at every position;
+    # every shorter pattern matching there is necessarily one of its prefixes.
+    regex = re.compile('(?=(' + _build_trie_pattern(patterns) + '))')
+    prefixes = {
+        pattern: [other for other in patterns if pattern.startswith(other)]
+        for pattern in patterns
+    }
+    # Skills each pattern can score for, in rule order, so scoring only visits skills seen in the text
+    pattern_skills = {}
+    for skill_lower, rule in rules.items():
+        for pattern in (skill_lower, *rule["variations"]):
+            pattern_skills.setdefault(pattern, []).append(skill_lower)
+    return regex, prefixes, rules, pattern_skills
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+SKILL_MATCHER, SKILL_PATTERN_PREFIXES, SKILL_RULES, SKILL_PATTERN_SKILLS = _build_skill_matcher()
+SKILL_RULE_ORDER = {skill_lower: i for i, skill_lower in enumerate(SKILL_RULES)}
+
+def _match_skills(text_lower):
+    """Score every skill found in lowercased text with a single pass of the matcher
+    
+    Returns (scores, counts): the extraction score of each found skill, and how
+    often it occurs as a whole word, counting its variations and abbreviations.
+    """
+    seen = set()           # patterns occurring anywhere as a substring
+    word_counts = Counter()  # non-overlapping occurrences with word boundaries on both sides
+    last_end = {}
+    text_length = len(text_lower)
+    
+    for match in SKILL_MATCHER.finditer(text_lower):
+        start = match.start()
+        longest = match.group(1)
+        if not longest:
+            continue
+        before = _is_word_char(text_lower[start - 1]) if start > 0 else False
+        starts_word = before != _is_word_char(text_lower[start])
+        
+        for pattern in SKILL_PATTERN_PREFIXES[longest]:
+            seen.add(pattern)
+            if not starts_word or start < last_end.get(pattern, 0):
+                continue
+            end = start + len(pattern)
+            after = _is_word_char(text_lower[end]) if end < text_length else False
+            if _is_word_char(text_lower[end - 1]) != after:
+                word_counts[pattern] += 1
+                last_end[pattern] = end
+    
+    # Only skills owning a pattern seen in the text can reach the threshold
+    candidates = {skill_lower for pattern in seen for skill_lower in SKILL_PATTERN_SKILLS[pattern]}
+    if '\\b' in text_lower:
+        candidates.update(skill_lower for skill_lower, rule in SKILL_RULES.items() if rule["abbreviations"])
+    
+    skill_matches = {}
+    skill_counts = {}
+    for skill_lower in sorted(candidates, key=SKILL_RULE_ORDER.__getitem__):
+        rule = SKILL_RULES[skill_lower]
         match_count = 0
         
         # Pattern 1: Exact word boundary match (highest priority)
-        exact_pattern = rf'\b{re.escape(skill_lower)}\b'
-        exact_matches = len(re.findall(exact_pattern, text_lower))
-        if exact_matches > 0:
-            match_count += exact_matches * 3  # Higher weight for exact matches
+        match_count += word_counts[skill_lower] * 3  # Higher weight for exact matches
         
         # Pattern 2: Case-insensitive substring match
-        if skill_lower in text_lower:
+        if skill_lower in seen:
             match_count += 1
         
-        # Pattern 3: Handle variations (e.g., "Node.js" vs "NodeJS")
-        variations = []
-        if '.' in skill_lower:
-            variations.append(skill_lower.replace('.', ''))
-        if ' ' in skill_lower:
-            variations.append(skill_lower.replace(' ', ''))
-        if '-' in skill_lower:
-            variations.append(skill_lower.replace('-', ''))
-        
-        for variation in variations:
-            if variation in text_lower:
+        # Pattern 3: Variations
+        for variation in rule["variations"]:
+            if variation in seen:
                 match_count += 1
         
-        # Pattern 4: Common abbreviations
-        abbreviations = {
-            'javascript': ['js'],
-            'typescript': ['ts'],
-            'machine learning': ['ml'],
-            'artificial intelligence': ['ai'],
-            'user interface': ['ui'],
-            'user experience': ['ux'],
-            'application programming interface': ['api'],
-            'structured query language': ['sql'],
-        }
-        
-        for full_name, abbrevs in abbreviations.items():
-            if skill_lower == full_name:
-                for abbrev in abbrevs:
-                    if f'\\b{abbrev}\\b' in text_lower:
-                        match_count += 2
+        # Pattern 4: Common abbreviations, looked up as the literal text "\bjs\b" as extraction
+        # always has; scoring them as whole words would find "js" in "vue.js" and "node.js"
+        for abbrev in rule["abbreviations"]:
+            if f'\\b{abbrev}\\b' in text_lower:
+                match_count += 2
         
         # Store skills with sufficient matches
         if match_count >= 2:  # Minimum threshold
-            found_skills.append(skill)
-            skill_matches[skill] = match_count
+            skill_matches[rule["skill"]] = match_count
+            occurrences = word_counts[skill_lower] + sum(word_counts[pattern] for pattern in rule["variations"])
+            # Found only inside longer words (e.g. "python3") still counts once
+            skill_counts[rule["skill"]] = max(occurrences, 1)
+    
+    return skill_matches, skill_counts
+
+def score_skills_in_text(text_lower):
+    """Score every skill found in lowercased text with a single pass of the matcher"""
+    return _match_skills(text_lower)[0]
+
+def count_skills_in_text(text_lower):
+    """Whole-word occurrences of every skill found in lowercased text"""
+    return _match_skills(text_lower)[1]
+
+# -----------------------------
+# Skill Registry
+# -----------------------------
+SKILL_CATEGORIES = {
+    "Programming Languages": PROGRAMMING_LANGUAGES,
+    "Web Technologies": WEB_TECHNOLOGIES,
+    "Databases": DATABASES,
+    "Data Science & AI": DATA_SCIENCE_AI,
+    "Cloud & DevOps": CLOUD_DEVOPS,
+    "Mobile Technologies": MOBILE_TECHNOLOGIES,
+    "Other Skills": OTHER_SKILLS
+}
+
+# Common alternative spellings (lowercase) -> canonical skill name
+SKILL_ALIASES = {
+    "node": "Node.js",
+    "reactjs": "React",
+    "react.js": "React",
+    "vue": "Vue.js",
+    "angularjs": "Angular",
+    "golang": "Go",
+    "postgres": "PostgreSQL",
+    "mongo": "MongoDB",
+    "k8s": "Kubernetes",
+    "gcp": "Google Cloud",
+    "amazon web services": "AWS",
+    "sklearn": "Scikit-learn",
+    "tf": "TensorFlow",
+    "powerbi": "Power BI",
+    "ci cd": "CI/CD",
+    "cicd": "CI/CD",
+    "ui/ux": "UI/UX Design",
+    "c sharp": "C#",
+    "cpp": "C++",
+}
+
+def _build_skill_registry():
+    """Build case-insensitive lookup, skill -> category and category sizes once at startup"""
+    lookup = {}
+    categories = {}
+    for category, category_skills in SKILL_CATEGORIES.items():
+        for skill in category_skills:
+            # A skill listed in several categories belongs to the first one
+            categories.setdefault(skill, category)
+    
+    for skill in ALL_SKILLS:
+        lookup.setdefault(skill.lower(), skill)
+    
+    # Spelling variations and abbreviations never override a real skill name
+    for skill in ALL_SKILLS:
+        for variation in skill_variations(skill.lower()):
+            lookup.setdefault(variation, skill)
+    for full_name, abbrevs in SKILL_ABBREVIATIONS.items():
+        if full_name in lookup:
+            for abbrev in abbrevs:
+                lookup.setdefault(abbrev, lookup[full_name])
+    for alias, skill in SKILL_ALIASES.items():
+        lookup.setdefault(alias, skill)
+    
+    sizes = {category: len(category_skills) for category, category_skills in SKILL_CATEGORIES.items()}
+    return lookup, categories, sizes
+
+SKILL_LOOKUP, SKILL_CATEGORY, CATEGORY_SIZES = _build_skill_registry()
+
+def canonical_skill(name):
+    """Return the canonical skill name for any casing or alias, or None if unknown"""
+    if not isinstance(name, str):
+        return None
+    return SKILL_LOOKUP.get(name.strip().lower())
+
+def canonicalize_skills(skills):
+    """Map skills to canonical names, dropping unknown ones and duplicates while keeping order"""
+    canonical = (canonical_skill(skill) for skill in skills)
+    return list(dict.fromkeys(skill for skill in canonical if skill))
+
+# -----------------------------
+# Enhanced Skills Extraction from Resume
+# -----------------------------
+class ResumeCache:
+    """Thread-safe LRU of extracted resume text and skills keyed by SHA-256 of the PDF bytes"""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, resume_hash):
+        with self._lock:
+            entry = self._entries.get(resume_hash)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(resume_hash)
+            self.hits += 1
+            return entry
+    
+    def set(self, resume_hash, text, skills):
+        with self._lock:
+            self._entries[resume_hash] = {"text": text, "skills": list(skills)}
+            self._entries.move_to_end(resume_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+RESUME_CACHE = ResumeCache(RESUME_CACHE_MAX_ENTRIES)
+
+# Extraction processes this worker may run at once, shared by all uploads
+_pdf_process_slots = threading.BoundedSemaphore(max(PDF_EXTRACT_PROCESSES, 1))
+_pdf_context = None
+_pdf_context_lock = threading.Lock()
+
+def _get_pdf_context():
+    """Multiprocessing context for extraction processes
+    
+    A forkserver (spawn where unavailable) so processes are not forked from this
+    worker and its scrape threads; the server preloads only pdf_worker.
+    """
+    global _pdf_context
+    with _pdf_context_lock:
+        if _pdf_context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                _pdf_context = multiprocessing.get_context("forkserver")
+                _pdf_context.set_forkserver_preload(["pdf_worker"])
+            else:
+                _pdf_context = multiprocessing.get_context("spawn")
+        return _pdf_context
+
+def _extract_pages_in_processes(pdf_bytes, page_count):
+    """Extract pages in processes of this request's own, killed once its budget is spent
     
-    # Remove duplicates and sort by match frequency
-    unique_skills = list(set(found_skills))
-    unique_skills.sort(key=lambda x: skill_matches.get(x, 0), reverse=True)
+    Returns (page texts, complete), or None for in-thread extraction when no
+    process is free or they can't start.
+    """
+    claimed = 0
+    while claimed < min(PDF_EXTRACT_PROCESSES, page_count) and _pdf_process_slots.acquire(blocking=False):
+        claimed += 1
+    if not claimed:
+        logger.info("All PDF extraction processes busy, extracting in-thread")
+        return None
+    
+    try:
+        try:
+            pool = _get_pdf_context().Pool(processes=claimed, initializer=pdf_worker.load_pdf, initargs=(pdf_bytes,))
+        except OSError as e:
+            logger.warning(f"PDF extraction processes unavailable, extracting in-thread: {e}")
+            return None
+        
+        # Leaving the block terminates the processes, including a page still being parsed
+        with pool:
+            results = [pool.apply_async(pdf_worker.extract_page_text, (page_num,)) for page_num in range(page_count)]
+            
+            # Each wave of processes gets one page budget
+            waves = -(-page_count // claimed)
+            deadline = time.monotonic() + PDF_PAGE_TIMEOUT * waves
+            
+            page_texts = []
+            for page_num, result in enumerate(results):
+                try:
+                    page_texts.append(result.get(timeout=_time_left(deadline)))
+                except multiprocessing.TimeoutError:
+                    logger.warning(f"PDF extraction budget exhausted at page {page_num}; skipping {page_count - page_num} pages")
+                    return page_texts, False
+                except Exception as e:
+                    logger.warning(f"Error extracting page {page_num}: {e}")
+            return page_texts, True
+    finally:
+        for _ in range(claimed):
+            _pdf_process_slots.release()
+
+def extract_pdf_text(pdf_stream):
+    """Extract text from the first PDF_MAX_PAGES pages of a PDF stream; returns (text, complete)"""
+    pdf_reader = PdfReader(pdf_stream)
+    page_count = len(pdf_reader.pages)
+    if page_count > PDF_MAX_PAGES:
+        logger.warning(f"PDF has {page_count} pages; extracting the first {PDF_MAX_PAGES}")
+        page_count = PDF_MAX_PAGES
+    
+    # Processes started for this request are killed when its time budget runs out
+    if PDF_EXTRACT_PROCESSES > 0 and page_count > 1:
+        pdf_stream.seek(0)
+        extracted = _extract_pages_in_processes(pdf_stream.read(), page_count)
+        if extracted is not None:
+            page_texts, complete = extracted
+            return "\n".join(text for text in page_texts if text), complete
+    
+    page_texts = []
+    complete = True
+    for page_num in range(page_count):
+        started = time.monotonic()
+        try:
+            extracted = pdf_reader.pages[page_num].extract_text()
+            if extracted:
+                page_texts.append(extracted)
+        except Exception as e:
+            logger.warning(f"Error extracting page {page_num}: {e}")
+            continue
+        if time.monotonic() - started > PDF_PAGE_TIMEOUT and page_num + 1 < page_count:
+            logger.warning(f"Page {page_num} exceeded the {PDF_PAGE_TIMEOUT}s budget; skipping the remaining pages")
+            complete = False
+            break
+    
+    return "\n".join(page_texts), complete
+
+def _open_pdf_source(source):
+    """Return a seekable file object holding the PDF (bytes, path or file-like source) and its SHA-256"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source), hashlib.sha256(source).hexdigest()
+    
+    if isinstance(source, (str, os.PathLike)):
+        stream = open(source, "rb")
+    else:
+        # Spills to a temp file above UPLOAD_SPOOL_THRESHOLD
+        stream = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_THRESHOLD)
+        shutil.copyfileobj(source, stream)
+    
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(64 * 1024), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return stream, digest.hexdigest()
+
+def extract_skills_from_resume(source):
+    """Extract technical skills directly from resume PDF content
+    
+    source may be PDF bytes, a file path, or a file-like object such as an upload stream.
+    """
+    logger.info("Starting skill extraction from resume...")
+    
+    try:
+        pdf_stream, resume_hash = _open_pdf_source(source)
+    except OSError as e:
+        logger.error(f"Error reading PDF: {e}")
+        return []
+    
+    with pdf_stream:
+        return _extract_skills_from_stream(pdf_stream, resume_hash)
+
+def _extract_skills_from_stream(pdf_stream, resume_hash):
+    """Parse an open PDF stream and score its skills, consulting the resume cache first"""
+    # Identical uploads skip parsing and matching entirely
+    cached = RESUME_CACHE.get(resume_hash)
+    if cached is not None:
+        logger.info(f"Resume cache hit ({resume_hash[:12]}): {len(cached['skills'])} skills")
+        return list(cached["skills"])
+    
+    # Extract text from PDF
+    try:
+        with STAGE_SECONDS.time("pdf_extract"):
+            text, complete = extract_pdf_text(pdf_stream)
+    except Exception as e:
+        logger.error(f"Error reading PDF: {e}")
+        return []
+    
+    if not text.strip():
+        logger.error("No text extracted from PDF")
+        return []
+    
+    logger.info(f"Extracted {len(text)} characters from resume")
+    
+    # Clean and normalize text
+    text = re.sub(r'\s+', ' ', text.strip())
+    text_lower = text.lower()
+    
+    # Find skills with the precompiled single-pass matcher
+    with STAGE_SECONDS.time("skill_match"):
+        skill_matches = score_skills_in_text(text_lower)
+    
+    # Sort by match frequency
+    unique_skills = sorted(skill_matches, key=lambda x: skill_matches[x], reverse=True)
+    # Text cut short by the time budget would otherwise stick for every later upload
+    if complete:
+        RESUME_CACHE.set(resume_hash, text, unique_skills)
     
     logger.info(f"Found {len(unique_skills)} skills: {unique_skills[:10]}...")
     return unique_skills
@@ -222,6 +1477,86 @@ def extract_skills_from_resume(file_path):
 # -----------------------------
 # Job Role Matching
 # -----------------------------
+# Define job roles with required and preferred skills
+JOB_ROLES = {
+    "Python Developer": {
+        "required": ["python"],
+        "preferred": ["django", "flask", "fastapi", "sql", "git", "rest api"],
+        "weight": 1.4
+    },
+    "Full Stack Developer": {
+        "required": ["javascript", "html", "css"],
+        "preferred": ["react", "node.js", "python", "sql", "git", "mongodb"],
+        "weight": 1.3
+    },
+    "Data Scientist": {
+        "required": ["python", "data analysis"],
+        "preferred": ["machine learning", "pandas", "numpy", "sql", "statistics", "matplotlib"],
+        "weight": 1.6
+    },
+    "Frontend Developer": {
+        "required": ["javascript", "html", "css"],
+        "preferred": ["react", "angular", "vue.js", "typescript", "bootstrap"],
+        "weight": 1.2
+    },
+    "Backend Developer": {
+        "required": ["python", "java", "node.js"],
+        "preferred": ["sql", "mongodb", "rest api", "microservices", "docker"],
+        "weight": 1.4
+    },
+    "Machine Learning Engineer": {
+        "required": ["python", "machine learning"],
+        "preferred": ["tensorflow", "pytorch", "deep learning", "nlp", "aws"],
+        "weight": 1.7
+    },
+    "DevOps Engineer": {
+        "required": ["linux", "docker"],
+        "preferred": ["kubernetes", "aws", "jenkins", "terraform", "ci/cd"],
+        "weight": 1.5
+    },
+    "Mobile Developer": {
+        "required": ["android", "ios", "react native", "flutter"],
+        "preferred": ["java", "swift", "kotlin", "mobile development"],
+        "weight": 1.3
+    },
+    "Database Administrator": {
+        "required": ["sql", "mysql", "postgresql"],
+        "preferred": ["oracle", "mongodb", "database design", "performance tuning"],
+        "weight": 1.3
+    },
+    "UI/UX Designer": {
+        "required": ["figma", "ui/ux design"],
+        "preferred": ["adobe xd", "sketch", "photoshop", "wireframing", "prototyping"],
+        "weight": 1.2
+    }
+}
+
+def _build_role_index(job_roles):
+    """Compile role definitions into a skill -> roles inverted index
+    
+    Scoring a skill set then only touches roles that share at least one skill with it,
+    so the cost grows with the candidate's skills rather than with the number of roles.
+    """
+    role_names = list(job_roles)
+    index = {}
+    for role_idx, role_name in enumerate(role_names):
+        role_data = job_roles[role_name]
+        for skill in role_data["required"]:
+            index.setdefault(skill.lower(), []).append((role_idx, True))
+        for skill in role_data["preferred"]:
+            index.setdefault(skill.lower(), []).append((role_idx, False))
+    
+    return {
+        "names": role_names,
+        "total_required": [len(job_roles[name]["required"]) for name in role_names],
+        "total_preferred": [len(job_roles[name]["preferred"]) for name in role_names],
+        "weights": [job_roles[name]["weight"] for name in role_names],
+        "skills": index
+    }
+
+ROLE_INDEX = _build_role_index(JOB_ROLES)
+
+@STAGE_SECONDS.timed("role_match")
 def match_job_roles(skills):
     """Match skills to relevant job roles"""
     if not skills:
@@ -229,88 +1564,37 @@ def match_job_roles(skills):
     
     skills_set = set(skill.lower() for skill in skills)
     
-    # Define job roles with required and preferred skills
-    job_roles = {
-        "Python Developer": {
-            "required": ["python"],
-            "preferred": ["django", "flask", "fastapi", "sql", "git", "rest api"],
-            "weight": 1.4
-        },
-        "Full Stack Developer": {
-            "required": ["javascript", "html", "css"],
-            "preferred": ["react", "node.js", "python", "sql", "git", "mongodb"],
-            "weight": 1.3
-        },
-        "Data Scientist": {
-            "required": ["python", "data analysis"],
-            "preferred": ["machine learning", "pandas", "numpy", "sql", "statistics", "matplotlib"],
-            "weight": 1.6
-        },
-        "Frontend Developer": {
-            "required": ["javascript", "html", "css"],
-            "preferred": ["react", "angular", "vue.js", "typescript", "bootstrap"],
-            "weight": 1.2
-        },
-        "Backend Developer": {
-            "required": ["python", "java", "node.js"],
-            "preferred": ["sql", "mongodb", "rest api", "microservices", "docker"],
-            "weight": 1.4
-        },
-        "Machine Learning Engineer": {
-            "required": ["python", "machine learning"],
-            "preferred": ["tensorflow", "pytorch", "deep learning", "nlp", "aws"],
-            "weight": 1.7
-        },
-        "DevOps Engineer": {
-            "required": ["linux", "docker"],
-            "preferred": ["kubernetes", "aws", "jenkins", "terraform", "ci/cd"],
-            "weight": 1.5
-        },
-        "Mobile Developer": {
-            "required": ["android", "ios", "react native", "flutter"],
-            "preferred": ["java", "swift", "kotlin", "mobile development"],
-            "weight": 1.3
-        },
-        "Database Administrator": {
-            "required": ["sql", "mysql", "postgresql"],
-            "preferred": ["oracle", "mongodb", "database design", "performance tuning"],
-            "weight": 1.3
-        },
-        "UI/UX Designer": {
-            "required": ["figma", "ui/ux design"],
-            "preferred": ["adobe xd", "sketch", "photoshop", "wireframing", "prototyping"],
-            "weight": 1.2
-        }
-    }
+    # Count required/preferred hits per role via the inverted index
+    required_counts = {}
+    preferred_counts = {}
+    for skill in skills_set:
+        for role_idx, is_required in ROLE_INDEX["skills"].get(skill, ()):
+            counts = required_counts if is_required else preferred_counts
+            counts[role_idx] = counts.get(role_idx, 0) + 1
     
     matches = []
     
-    for role_name, role_data in job_roles.items():
-        required_skills = [s.lower() for s in role_data["required"]]
-        preferred_skills = [s.lower() for s in role_data["preferred"]]
-        
-        # Calculate skill matches
-        required_matches = len(skills_set & set(required_skills))
-        preferred_matches = len(skills_set & set(preferred_skills))
-        
-        # Must have at least one required skill
-        if required_matches == 0:
-            continue
+    # Must have at least one required skill; visit roles in definition order
+    for role_idx in sorted(required_counts):
+        required_matches = required_counts[role_idx]
+        preferred_matches = preferred_counts.get(role_idx, 0)
+        total_required = ROLE_INDEX["total_required"][role_idx]
+        total_preferred = ROLE_INDEX["total_preferred"][role_idx]
         
         # Calculate score
-        required_score = (required_matches / len(required_skills)) * 70
-        preferred_score = (preferred_matches / len(preferred_skills)) * 30
+        required_score = (required_matches / total_required) * 70
+        preferred_score = (preferred_matches / total_preferred) * 30
         
-        total_score = (required_score + preferred_score) * role_data["weight"]
+        total_score = (required_score + preferred_score) * ROLE_INDEX["weights"][role_idx]
         final_score = min(total_score, 100)
         
         matches.append({
-            "title": role_name,
+            "title": ROLE_INDEX["names"][role_idx],
             "score": round(final_score, 1),
             "required_matches": required_matches,
-            "total_required": len(required_skills),
+            "total_required": total_required,
             "preferred_matches": preferred_matches,
-            "total_preferred": len(preferred_skills)
+            "total_preferred": total_preferred
         })
     
     # Sort by score
@@ -320,13 +1604,339 @@ def match_job_roles(skills):
 # -----------------------------
 # Enhanced Job Scraping with Better Company Extraction
 # -----------------------------
-def scrape_internshala_jobs(skills, limit=6):
-    """Scrape Internshala jobs based on extracted skills"""
+def normalize_query(query):
+    """Normalize a search query for use as a cache key"""
+    return re.sub(r'\s+', ' ', query.strip().lower())
+
+class SharedJobStore:
+    """SQLite (WAL mode) job listing store shared by every worker process on the box"""
+    
+    PURGE_EVERY = 100  # Writes between sweeps of expired rows
+    
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        self._connect()
+    
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_cache ("
+                "portal TEXT NOT NULL, query TEXT NOT NULL, jobs TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (portal, query))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scrape_jobs ("
+                "job_id TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+    
+    def get(self, portal, query):
+        """Return (jobs, stored_at) for an unexpired entry, else None"""
+        try:
+            row = self._connect().execute(
+                "SELECT jobs, stored_at FROM job_cache WHERE portal = ? AND query = ? AND expires_at > ?",
+                (portal, query, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Job store read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+    
+    def set(self, portal, query, jobs, stored_at, expires_at):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO job_cache (portal, query, jobs, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (portal, query, json.dumps(jobs), stored_at, expires_at)
+                )
+                self._writes += 1
+                if self._writes % self.PURGE_EVERY == 0:
+                    self._purge(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"Job store write failed: {e}")
+    
+    def _purge(self, conn):
+        now = time.time()
+        conn.execute("DELETE FROM job_cache WHERE expires_at <= ?", (now,))
+        conn.execute("DELETE FROM scrape_jobs WHERE expires_at <= ?", (now,))
+    
+    def get_scrape_job(self, job_id):
+        """Return the last saved state of a background scrape job, else None"""
+        try:
+            row = self._connect().execute(
+                "SELECT state FROM scrape_jobs WHERE job_id = ? AND expires_at > ?",
+                (job_id, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Job store read failed: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+    
+    def set_scrape_job(self, job_id, state, expires_at):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO scrape_jobs (job_id, state, expires_at) VALUES (?, ?, ?)",
+                    (job_id, json.dumps(state), expires_at)
+                )
+                self._writes += 1
+                if self._writes % self.PURGE_EVERY == 0:
+                    self._purge(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"Job store write failed: {e}")
+    
+    def clear(self):
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM job_cache")
+        except sqlite3.Error as e:
+            logger.warning(f"Job store clear failed: {e}")
+
+class JobCache:
+    """Thread-safe TTL + LRU cache of scraped jobs keyed by (portal, normalized query)"""
+    
+    def __init__(self, ttl, stale_ttl, max_entries, store=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.store = store  # Optional SharedJobStore behind the in-process LRU
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+    
+    def get(self, portal, query):
+        """Return (jobs, is_fresh), or None when missing or too old to serve"""
+        key = (portal, normalize_query(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result = self._classify(key, entry)
+                if result is not None:
+                    return result
+                del self._entries[key]
+        
+        # Fall back to the store shared with other workers
+        if self.store is not None:
+            entry = self.store.get(*key)
+            if entry is not None:
+                with self._lock:
+                    self._put(key, entry)
+                    result = self._classify(key, entry)
+                    if result is not None:
+                        self.store_hits += 1
+                        return result
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def _classify(self, key, entry):
+        """Count and return a served entry, or None if it is past the stale window"""
+        jobs, stored_at = entry
+        age = time.time() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            return None
+        self._entries.move_to_end(key)
+        if age <= self.ttl:
+            self.hits += 1
+            return jobs, True
+        self.stale_hits += 1
+        return jobs, False
+    
+    def _put(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def set(self, portal, query, jobs):
+        key = (portal, normalize_query(query))
+        stored_at = time.time()
+        with self._lock:
+            self._put(key, (list(jobs), stored_at))
+        if self.store is not None:
+            self.store.set(*key, list(jobs), stored_at, stored_at + self.ttl + self.stale_ttl)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "shared_store": self.store.path if self.store is not None else None
+            }
+
+def _open_shared_job_store(path):
+    """Open the shared job store, falling back to in-process caching on failure"""
+    if not path:
+        return None
+    try:
+        return SharedJobStore(path)
+    except sqlite3.Error as e:
+        logger.warning(f"Shared job store unavailable ({path}): {e}")
+        return None
+
+JOB_CACHE = JobCache(
+    JOB_CACHE_TTL_SECONDS, JOB_CACHE_STALE_SECONDS, JOB_CACHE_MAX_ENTRIES,
+    store=_open_shared_job_store(JOB_CACHE_DB)
+)
+
+# Background refreshes of stale cache entries
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-cache-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _scrape_and_cache(portal, query, deadline=None):
+    """Scrape one query and remember non-empty results"""
+    jobs = _scrape_portal_query(portal, query, deadline)
+    if jobs:
+        JOB_CACHE.set(portal, query, jobs)
+    return jobs
+
+def _refresh_in_background(portal, query):
+    """Re-scrape a stale query once, without blocking the caller"""
+    key = (portal, normalize_query(query))
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    
+    def refresh():
+        try:
+            _scrape_and_cache(portal, query)
+        except Exception as e:
+            logger.error(f"Error refreshing {portal} cache for '{query}': {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+    
+    _submit_in_context(_refresh_executor, refresh)
+
+def _split_cached_queries(portal, queries):
+    """Answer what the cache can; returns ({query: jobs}, queries still to scrape)
+    
+    The cache holds every job parsed from a query's page, whatever limit the
+    scrape that filled it had; callers cut each query's jobs to their own limit.
+    """
+    results = {}
+    misses = []
+    for query in queries:
+        cached = JOB_CACHE.get(portal, query)
+        if cached is None:
+            misses.append(query)
+            continue
+        jobs, is_fresh = cached
+        results[query] = jobs
+        if not is_fresh:
+            _refresh_in_background(portal, query)
+    
+    breaker = portal_breaker(portal)
+    if misses and breaker and breaker.is_open():
+        logger.info(f"{portal}: circuit open, skipping {len(misses)} uncached queries")
+        misses = []
+    return results, misses
+
+def _jobs_in_query_order(results, queries, limit):
     jobs = []
+    for query in queries:
+        jobs.extend(results.get(query, [])[:limit])
+    return jobs[:limit]
+
+def _scrape_queries(portal, queries, limit, deadline=None):
+    """Answer a portal's search queries from cache, scraping misses in parallel, in query order"""
+    if not queries:
+        return []
     
+    results, misses = _split_cached_queries(portal, queries)
+    found = sum(min(len(jobs), limit) for jobs in results.values())
+    if misses and found < limit:
+        executor = ThreadPoolExecutor(
+            max_workers=min(PORTAL_MAX_CONCURRENCY, len(misses)),
+            thread_name_prefix=f"scrape-{portal.lower()}"
+        )
+        futures = {
+            _submit_in_context(executor, _scrape_and_cache, portal, query, deadline): query
+            for query in misses
+        }
+        pending = set(futures)
+        
+        try:
+            while pending and found < limit:
+                done, pending = wait(pending, timeout=_time_left(deadline), return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.warning(f"{portal}: deadline reached with {len(pending)} queries outstanding")
+                    break
+                for future in done:
+                    try:
+                        results[futures[future]] = future.result()
+                        found += min(len(results[futures[future]]), limit)
+                    except Exception as e:
+                        logger.error(f"Error in {portal} query: {e}")
+        finally:
+            # Drop queries that have not started yet; running ones stop at their next fetch
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    return _jobs_in_query_order(results, queries, limit)
+
+def _scrape_portal_query(portal, query, deadline=None):
+    """Scrape a single search query, trying the portal's URL patterns until one yields jobs
+    
+    Returns every job on the page, so the cached result serves any limit.
+    """
+    _, build_urls, parse_page = PORTAL_SCRAPERS[portal]
+    jobs = []
+    
+    try:
+        for url in build_urls(query):
+            logger.info(f"Scraping {portal}: {query}")
+            response = safe_request(url, deadline=deadline)
+            
+            if not response:
+                continue
+            
+            jobs = parse_page(response.content, query, None)
+            if jobs:
+                break
+    except Exception as e:
+        logger.error(f"Error scraping {portal} for '{query}': {e}")
+    
+    return jobs
+
+@PORTAL_SCRAPE_SECONDS.timed("Internshala")
+def scrape_internshala_jobs(skills, limit=6, deadline=None):
+    """Scrape Internshala jobs based on extracted skills"""
     if not skills:
-        return jobs
+        return []
     
+    return _scrape_queries("Internshala", _internshala_queries(skills), limit, deadline)
+
+def _internshala_queries(skills):
     # Create targeted search queries from skills
     search_queries = []
     for skill in skills[:3]:  # Top 3 skills
@@ -338,544 +1948,1365 @@ def scrape_internshala_jobs(skills, limit=6):
         ]
         search_queries.extend(queries)
     
-    # Remove duplicates and limit queries
-    search_queries = list(set(search_queries))[:4]
+    # Remove duplicates (keeping order so cache keys are stable) and limit queries
+    return list(dict.fromkeys(search_queries))[:4]
+
+def _internshala_urls(query):
+    # Try different URL patterns
+    formatted_query = query.replace(" ", "-").lower()
+    return [
+        f"https://internshala.com/internships/keywords-{formatted_query}",
+        f"https://internshala.com/jobs/keywords-{formatted_query}",
+        f"https://internshala.com/internships/{formatted_query}"
+    ]
+
+def _parse_internshala_page(content, query, limit):
+    """Extract job listings from one Internshala search results page"""
+    jobs = []
+    formatted_query = query.replace(" ", "-").lower()
+    soup = parse_html(content)
     
-    for query in search_queries:
+    # Try multiple selectors for job cards, starting with the one that worked last
+    selector, job_cards = select_cards(soup, "Internshala", [
+        'div.individual_internship',
+        'div.internship_meta',
+        'div[id*="internship"]',
+        'div.job-tile',
+        'div.container-fluid.individual_internship'
+    ], limit)
+    if job_cards:
+        logger.info(f"Found {len(job_cards)} job cards with selector: {selector}")
+    
+    for card in job_cards:
         try:
-            # Format query for URL
-            formatted_query = query.replace(" ", "-").lower()
+            # Extract title with multiple selectors, the last one without anchor tag
+            title = select_field(card, "Internshala", "title", [
+                'h3.job-internship-name a',
+                'h4.job-internship-name a',
+                'h3 a',
+                '.profile h3 a',
+                '.heading_4_5 a',
+                'a[href*="internship/detail"]',
+                'h3, h4, .profile, .heading_4_5'
+            ], element_text)
             
-            # Try different URL patterns
-            urls = [
-                f"https://internshala.com/internships/keywords-{formatted_query}",
-                f"https://internshala.com/jobs/keywords-{formatted_query}",
-                f"https://internshala.com/internships/{formatted_query}"
-            ]
+            # Extract company with multiple selectors
+            company = select_field(card, "Internshala", "company", [
+                '.company-name',
+                '.company_name',
+                'p.company_name',
+                'a.link_display_like_text',
+                '.company',
+                'h4 + p',
+                '.text-muted'
+            ], _internshala_company)
             
-            for url in urls:
-                logger.info(f"Scraping Internshala: {query}")
-                response = safe_request(url)
-                
-                if not response:
-                    continue
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Try multiple selectors for job cards
-                job_cards = []
-                selectors = [
-                    'div.individual_internship',
-                    'div.internship_meta',
-                    'div[id*="internship"]',
-                    'div.job-tile',
-                    'div.container-fluid.individual_internship'
-                ]
-                
-                for selector in selectors:
-                    job_cards = soup.select(selector)[:limit]
-                    if job_cards:
-                        logger.info(f"Found {len(job_cards)} job cards with selector: {selector}")
-                        break
+            # Extract link
+            link = select_field(card, "Internshala", "link", [
+                'a[href*="internship/detail"]',
+                'a[href*="job/detail"]',
+                '.view_detail_button',
+                'h3 a',
+                'h4 a'
+            ], absolute_link("https://internshala.com"))
+            
+            # Validate and add job
+            if title and len(title) > 5:  # Basic validation
+                jobs.append({
+                    "title": title,
+                    "company": company or "Internshala Partner Company",
+                    "link": link or f"https://internshala.com/internships/keywords-{formatted_query}",
+                    "source": "Internshala",
+                    "query_used": query
+                })
                 
-                for card in job_cards:
-                    try:
-                        # Extract title with multiple selectors
-                        title = None
-                        title_selectors = [
-                            'h3.job-internship-name a',
-                            'h4.job-internship-name a',
-                            'h3 a',
-                            '.profile h3 a',
-                            '.heading_4_5 a',
-                            'a[href*="internship/detail"]'
-                        ]
-                        
-                        for sel in title_selectors:
-                            elem = card.select_one(sel)
-                            if elem:
-                                title = elem.get_text(strip=True)
-                                break
-                        
-                        if not title:
-                            # Try without anchor tag
-                            title_elem = card.select_one('h3, h4, .profile, .heading_4_5')
-                            if title_elem:
-                                title = title_elem.get_text(strip=True)
-                        
-                        # Extract company with multiple selectors
-                        company = None
-                        company_selectors = [
-                            '.company-name',
-                            '.company_name',
-                            'p.company_name',
-                            'a.link_display_like_text',
-                            '.company',
-                            'h4 + p',
-                            '.text-muted'
-                        ]
-                        
-                        for sel in company_selectors:
-                            elem = card.select_one(sel)
-                            if elem:
-                                company_text = elem.get_text(strip=True)
-                                # Clean up company name
-                                company_text = re.sub(r'\s+', ' ', company_text)
-                                if company_text and len(company_text) < 100:  # Reasonable company name length
-                                    company = company_text
-                                    break
-                        
-                        # Extract link
-                        link = None
-                        link_selectors = [
-                            'a[href*="internship/detail"]',
-                            'a[href*="job/detail"]',
-                            '.view_detail_button',
-                            'h3 a',
-                            'h4 a'
-                        ]
-                        
-                        for sel in link_selectors:
-                            elem = card.select_one(sel)
-                            if elem and elem.get('href'):
-                                href = elem['href']
-                                if href.startswith('/'):
-                                    link = f"https://internshala.com{href}"
-                                elif href.startswith('http'):
-                                    link = href
-                                break
-                        
-                        # Validate and add job
-                        if title and len(title) > 5:  # Basic validation
-                            jobs.append({
-                                "title": title,
-                                "company": company or "Internshala Partner Company",
-                                "link": link or f"https://internshala.com/internships/keywords-{formatted_query}",
-                                "source": "Internshala",
-                                "query_used": query
-                            })
-                            
-                    except Exception as e:
-                        logger.error(f"Error parsing Internshala job card: {e}")
-                        continue
+        except Exception as e:
+            logger.error(f"Error parsing Internshala job card: {e}")
+            continue
+    
+    return jobs
+
+def _internshala_company(elem):
+    # Clean up company name, rejecting blocks of text that are not a name
+    company_text = re.sub(r'\s+', ' ', elem.get_text(strip=True))
+    if company_text and len(company_text) < 100:  # Reasonable company name length
+        return company_text
+    return None
+
+@PORTAL_SCRAPE_SECONDS.timed("Naukri")
+def scrape_naukri_jobs(skills, limit=6, deadline=None):
+    """Scrape Naukri jobs based on extracted skills"""
+    if not skills:
+        return []
+    
+    return _scrape_queries("Naukri", _naukri_queries(skills), limit, deadline)
+
+def _naukri_queries(skills):
+    # Create search queries from skills
+    return [f"{skill} jobs" for skill in skills[:3]]
+
+def _naukri_urls(query):
+    # Format query for Naukri URL
+    return [f"https://www.naukri.com/{query.replace(' ', '-').lower()}"]
+
+def _parse_naukri_page(content, query, limit):
+    """Extract job listings from one Naukri search results page"""
+    jobs = []
+    soup = parse_html(content)
+    
+    # Try multiple selectors, starting with the one that worked last
+    _, job_cards = select_cards(soup, "Naukri", [
+        'article.jobTuple',
+        'div.srp-jobtuple-wrapper',
+        'div.jobTuple',
+        'div[class*="job"]'
+    ], limit)
+    if job_cards:
+        logger.info(f"Found {len(job_cards)} Naukri jobs")
+    
+    for card in job_cards:
+        try:
+            # Extract title
+            title = select_field(card, "Naukri", "title", [
+                'a.title',
+                '.jobTupleHeader .title a',
+                'h3 a',
+                'h4 a',
+                '[data-job-title]'
+            ], element_text)
+            
+            # Extract company
+            company = select_field(card, "Naukri", "company", [
+                'a.subTitle',
+                '.company',
+                '.companyInfo',
+                '.comp-name',
+                '.jobTupleHeader .subTitle'
+            ], _naukri_company)
+            
+            # Extract link
+            link_elem = card.select_one('a.title, h3 a, h4 a')
+            link = absolute_link("https://www.naukri.com")(link_elem) if link_elem else None
+            
+            if title:
+                jobs.append({
+                    "title": title,
+                    "company": company or "Naukri Partner Company",
+                    "link": link or _naukri_urls(query)[0],
+                    "source": "Naukri",
+                    "query_used": query
+                })
                 
-                if jobs:
-                    break
-                    
-                time.sleep(random.uniform(1, 3))
+        except Exception as e:
+            logger.error(f"Error parsing Naukri job: {e}")
+            continue
+    
+    return jobs
+
+def _naukri_company(elem):
+    company = elem.get_text(strip=True)
+    return company if len(company) < 80 else None
+
+@PORTAL_SCRAPE_SECONDS.timed("Indeed")
+def scrape_indeed_jobs(skills, limit=6, deadline=None):
+    """Scrape Indeed jobs based on extracted skills"""
+    if not skills:
+        return []
+    
+    return _scrape_queries("Indeed", _indeed_queries(skills), limit, deadline)
+
+def _indeed_queries(skills):
+    return [f"{skill} developer" for skill in skills[:3]]
+
+def _indeed_urls(query):
+    return [f"https://in.indeed.com/jobs?q={quote_plus(query)}&l=India"]
+
+def _parse_indeed_page(content, query, limit):
+    """Extract job listings from one Indeed search results page"""
+    jobs = []
+    soup = parse_html(content)
+    
+    # Try multiple selectors, starting with the one that worked last
+    _, job_cards = select_cards(soup, "Indeed", [
+        'div[data-result-id]',
+        'div.job_seen_beacon',
+        'td.resultContent',
+        'div.slider_container'
+    ], limit)
+    if job_cards:
+        logger.info(f"Found {len(job_cards)} Indeed jobs")
+    
+    for card in job_cards:
+        try:
+            # Extract title
+            title = select_field(card, "Indeed", "title", [
+                'h2 a span[title]',
+                'h2.jobTitle a span',
+                '.jobTitle a',
+                'h2 span[title]'
+            ], lambda elem: elem.get('title') or elem.get_text(strip=True))
             
-            if len(jobs) >= limit:
-                break
+            # Extract company
+            company = select_field(card, "Indeed", "company", [
+                'span.companyName',
+                '.companyName',
+                'span[data-testid="company-name"]',
+                '.company'
+            ], element_text)
+            
+            # Extract link
+            link_elem = card.select_one('h2 a, .jobTitle a')
+            link = absolute_link("https://in.indeed.com")(link_elem) if link_elem else None
+            
+            if title:
+                jobs.append({
+                    "title": title,
+                    "company": company or "Indeed Partner Company",
+                    "link": link or _indeed_urls(query)[0],
+                    "source": "Indeed",
+                    "query_used": query
+                })
                 
         except Exception as e:
-            logger.error(f"Error scraping Internshala for '{query}': {e}")
+            logger.error(f"Error parsing Indeed job: {e}")
             continue
     
-    return jobs[:limit]
+    return jobs
 
-def scrape_naukri_jobs(skills, limit=6):
-    """Scrape Naukri jobs based on extracted skills"""
+# How each portal is searched: skills -> queries, query -> URLs to try, page -> jobs.
+# Shared by the threaded scrapers above and the async ones used under asgi.py.
+PORTAL_SCRAPERS = {
+    "Internshala": (_internshala_queries, _internshala_urls, _parse_internshala_page),
+    "Naukri": (_naukri_queries, _naukri_urls, _parse_naukri_page),
+    "Indeed": (_indeed_queries, _indeed_urls, _parse_indeed_page)
+}
+
+# Title words spelled several ways across portals
+TITLE_ABBREVIATIONS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "jnr": "junior",
+    "dev": "developer", "devs": "developers", "engg": "engineer", "eng": "engineer", "engr": "engineer",
+    "mgr": "manager", "asst": "assistant", "assoc": "associate", "exec": "executive",
+    "mgmt": "management", "admin": "administrator", "&": "and"
+}
+# Seniority words that make otherwise similar titles different jobs
+TITLE_LEVEL_WORDS = {"intern", "trainee", "junior", "associate", "senior", "lead", "staff", "principal", "head", "i", "ii", "iii"}
+# Work-mode words portals append to the same opening ("Python Developer - Remote")
+TITLE_NOISE_WORDS = {"remote", "hybrid", "onsite", "wfh"}
+# Legal-form words that differ between listings of the same employer
+COMPANY_SUFFIXES = {"pvt", "private", "ltd", "limited", "inc", "llp", "llc", "corp", "corporation", "co", "the"}
+
+def normalize_job_title(title):
+    """Lowercase, drop punctuation and work-mode words and expand abbreviations ("Sr. Python Dev" -> "senior python developer")"""
+    words = re.findall(r"[a-z0-9+#]+|&", title.lower())
+    return " ".join(TITLE_ABBREVIATIONS.get(word, word) for word in words if word not in TITLE_NOISE_WORDS)
+
+def normalize_company(company):
+    words = re.findall(r"[a-z0-9+&]+", company.lower())
+    return " ".join(word for word in words if word not in COMPANY_SUFFIXES)
+
+class JobDeduplicator:
+    """Drops exact and near-duplicate jobs in near-linear time"""
+    
+    def __init__(self, threshold=None, bands=8, rows=2):
+        self.threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(24)  # Fixed so signatures are comparable across instances
+        # Each MinHash function is crc32 XOR a random mask, cheap enough to run in C via map()
+        self._masks = [rng.getrandbits(32) for _ in range(bands * rows)]
+        self._exact = set()
+        self._buckets = {}
+        self._shingles = []
+        self._words = []
+    
+    @staticmethod
+    def shingles(title):
+        padded = f" {title} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)} or {padded}
+    
+    def similarity(self, shingles, other):
+        return len(shingles & other) / len(shingles | other)
+    
+    def _respelled(self, words, other_words):
+        """Whether the words only one title has pair up as respellings ("developr" / "developer")"""
+        only_here = words - other_words
+        only_there = other_words - words
+        if len(only_here) != len(only_there):
+            return False
+        there_shingles = [self.shingles(word) for word in only_there]
+        return all(
+            any(self.similarity(self.shingles(word), other) >= self.threshold for other in there_shingles)
+            for word in only_here
+        )
+    
+    def _signature(self, shingles):
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+    
+    def add(self, job):
+        """Remember the job and return True, or return False if it duplicates one already seen"""
+        title = normalize_job_title(job["title"])
+        company = normalize_company(job["company"])
+        if (title, company) in self._exact:
+            return False
+        
+        # Same company and seniority only; MinHash bands of the title's character 3-grams
+        # pick the few earlier jobs worth an exact Jaccard check
+        shingles = self.shingles(title)
+        signature = self._signature(shingles)
+        levels = frozenset(word for word in title.split() if word in TITLE_LEVEL_WORDS)
+        keys = [
+            (company, levels, band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+        words = frozenset(title.split())
+        candidates = {seen for key in keys for seen in self._buckets.get(key, ())}
+        # Similar characters alone would merge "SQL Developer" into "MySQL Developer", so the
+        # words the titles don't share must also be respellings of each other
+        for seen in candidates:
+            if (self.similarity(shingles, self._shingles[seen]) >= self.threshold
+                    and self._respelled(words, self._words[seen])):
+                return False
+        
+        self._exact.add((title, company))
+        self._shingles.append(shingles)
+        self._words.append(words)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(len(self._shingles) - 1)
+        return True
+
+@STAGE_SECONDS.timed("dedup")
+def deduplicate_jobs(jobs, seen_jobs=None):
+    """Remove duplicate and near-duplicate jobs (see JobDeduplicator), keeping first occurrences
+    
+    Pass the same JobDeduplicator as seen_jobs across calls to deduplicate incrementally.
+    """
+    if seen_jobs is None:
+        seen_jobs = JobDeduplicator()
+    return [job for job in jobs if seen_jobs.add(job)]
+
+# -----------------------------
+# Relevance Ranking
+# -----------------------------
+BM25_K1 = 1.2  # Term frequency saturation
+BM25_B = 0.75  # Job text length normalization
+
+def skill_weights(skills):
+    """Weight a resume's skills by rank; extract_skills_from_resume lists the most mentioned first"""
+    return {skill: 1.0 / math.log2(rank + 2) for rank, skill in enumerate(skills)}
+
+def _job_text(job):
+    parts = [job.get("title", ""), job.get("desc") or job.get("description") or ""]
+    parts.extend(job.get("matched_skills", []))
+    return " ".join(parts).lower()
+
+@STAGE_SECONDS.timed("rank")
+def rank_jobs(jobs, skills, limit=None):
+    """Order jobs by BM25 relevance of their text to the weighted skill profile, best first"""
+    if not jobs:
+        return []
+    weights = skill_weights(skills)
+    
+    # Terms are canonical skills, so scoring only touches the few a job mentions;
+    # IDF comes from the candidate set itself
+    job_terms = []
+    lengths = []
+    doc_freq = Counter()
+    for job in jobs:
+        text = _job_text(job)
+        terms = {skill: count for skill, count in count_skills_in_text(text).items() if skill in weights}
+        job_terms.append(terms)
+        lengths.append(max(len(text.split()), 1))
+        doc_freq.update(terms.keys())
+    
+    total = len(jobs)
+    avg_length = sum(lengths) / total
+    idf = {skill: math.log(1 + (total - df + 0.5) / (df + 0.5)) for skill, df in doc_freq.items()}
+    
+    scored = []
+    for position, (job, terms, length) in enumerate(zip(jobs, job_terms, lengths)):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+        score = sum(
+            weights[skill] * idf[skill] * count * (BM25_K1 + 1) / (count + norm)
+            for skill, count in terms.items()
+        )
+        # Position breaks ties, keeping the incoming order
+        scored.append((-score, position, job))
+    scored.sort(key=lambda item: item[:2])
+    
+    if limit is not None:
+        scored = scored[:limit]
+    # Jobs may be shared with the cache, so annotate copies
+    return [{**job, "relevance": round(-neg_score, 4)} for neg_score, _, job in scored]
+
+def scrape_all_jobs(skills, deadline_seconds=None, on_portal_done=None, truncated=None):
+    """Scrape jobs from all portals concurrently and return the 15 most relevant to the skills"""
+    logger.info(f"Starting job scraping for skills: {skills[:5]}...")
+    
+    # on_portal_done(portal_name, jobs) is called as each portal finishes; portals cut
+    # short by the deadline keep what they found and are appended to truncated
+    if deadline_seconds is None:
+        deadline_seconds = SCRAPE_DEADLINE_SECONDS
+    deadline = ScrapeDeadline(time.monotonic() + deadline_seconds)
+    # Portals honour the deadline themselves; the small grace covers result collection
+    collect_deadline = deadline + 1
+    
+    # Scrape from each portal
+    scrapers = [
+        ("Internshala", scrape_internshala_jobs),
+        ("Naukri", scrape_naukri_jobs),
+        ("Indeed", scrape_indeed_jobs)
+    ]
+    
+    executor = ThreadPoolExecutor(max_workers=len(scrapers), thread_name_prefix="scrape-portal")
+    futures = {
+        _submit_in_context(executor, scraper_func, skills, RANK_CANDIDATES_PER_PORTAL, deadline): scraper_name
+        for scraper_name, scraper_func in scrapers
+    }
+    logger.info(f"Scraping {', '.join(futures.values())} in parallel...")
+    
+    portal_jobs = {}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=_time_left(collect_deadline), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                scraper_name = futures[future]
+                # A portal returning at the deadline, or unable to fit requests into it, stopped with queries outstanding
+                if truncated is not None and _portal_truncated(scraper_name, deadline):
+                    truncated.append(scraper_name)
+                try:
+                    jobs = future.result()
+                    portal_jobs[scraper_name] = jobs
+                    logger.info(f"{scraper_name}: Found {len(jobs)} jobs")
+                except Exception as e:
+                    logger.error(f"Error in {scraper_name} scraper: {e}")
+                    jobs = []
+                if on_portal_done:
+                    on_portal_done(scraper_name, jobs)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    for future in pending:
+        logger.warning(f"{futures[future]}: no results before the deadline")
+        if truncated is not None:
+            truncated.append(futures[future])
+    
+    return _merge_portal_jobs(portal_jobs, skills)
+
+def _merge_portal_jobs(portal_jobs, skills):
+    """Deduplicate {portal: jobs} and return the 15 most relevant"""
+    # Keep portal order stable regardless of which finished first
+    all_jobs = []
+    for portal in PORTAL_SCRAPERS:
+        all_jobs.extend(portal_jobs.get(portal, []))
+    
+    unique_jobs = deduplicate_jobs(all_jobs)
+    
+    logger.info(f"Total unique jobs found: {len(unique_jobs)}")
+    return rank_jobs(unique_jobs, skills, limit=15)  # Return top 15 jobs
+
+# -----------------------------
+# Async Scraping
+# -----------------------------
+# The same pipeline as scrape_all_jobs, but as coroutines: an upload waiting on
+# portals costs a suspended task instead of a blocked thread. Used by asgi.py.
+async def _scrape_portal_query_async(portal, query, deadline=None):
+    """Scrape a single search query, trying the portal's URL patterns until one yields jobs"""
+    _, build_urls, parse_page = PORTAL_SCRAPERS[portal]
     jobs = []
     
-    if not skills:
-        return jobs
+    try:
+        for url in build_urls(query):
+            logger.info(f"Scraping {portal}: {query}")
+            response = await safe_request_async(url, deadline=deadline)
+            
+            if not response:
+                continue
+            
+            # Parsing is CPU work; keep it off the event loop
+            jobs = await asyncio.to_thread(parse_page, response.content, query, None)
+            if jobs:
+                break
+    except Exception as e:
+        logger.error(f"Error scraping {portal} for '{query}': {e}")
     
-    # Create search queries from skills
-    search_queries = [f"{skill} jobs" for skill in skills[:3]]
+    return jobs
+
+async def _scrape_queries_async(portal, queries, limit, deadline=None):
+    """Async _scrape_queries: cache first, then up to PORTAL_MAX_CONCURRENCY misses at a time"""
+    if not queries:
+        return []
     
-    for query in search_queries:
+    # The cache may be backed by SQLite, so it is read and written on threads
+    results, misses = await asyncio.to_thread(_split_cached_queries, portal, queries)
+    found = sum(min(len(jobs), limit) for jobs in results.values())
+    if misses and found < limit:
+        slots = asyncio.Semaphore(PORTAL_MAX_CONCURRENCY)
+        
+        async def scrape(query):
+            async with slots:
+                jobs = await _scrape_portal_query_async(portal, query, deadline)
+            if jobs:
+                await asyncio.to_thread(JOB_CACHE.set, portal, query, jobs)
+            return jobs
+        
+        tasks = {asyncio.ensure_future(scrape(query)): query for query in misses}
+        pending = set(tasks)
+        
         try:
-            # Format query for Naukri URL
-            formatted_query = query.replace(" ", "-").lower()
-            url = f"https://www.naukri.com/{formatted_query}"
-            
-            logger.info(f"Scraping Naukri: {query}")
-            response = safe_request(url)
-            
-            if response:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Try multiple selectors
-                job_cards = []
-                selectors = [
-                    'article.jobTuple',
-                    'div.srp-jobtuple-wrapper',
-                    'div.jobTuple',
-                    'div[class*="job"]'
-                ]
-                
-                for selector in selectors:
-                    job_cards = soup.select(selector)[:limit]
-                    if job_cards:
-                        logger.info(f"Found {len(job_cards)} Naukri jobs")
-                        break
-                
-                for card in job_cards:
+            while pending and found < limit:
+                done, pending = await asyncio.wait(pending, timeout=_time_left(deadline), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.warning(f"{portal}: deadline reached with {len(pending)} queries outstanding")
+                    break
+                for task in done:
                     try:
-                        # Extract title
-                        title = None
-                        title_selectors = [
-                            'a.title',
-                            '.jobTupleHeader .title a',
-                            'h3 a',
-                            'h4 a',
-                            '[data-job-title]'
-                        ]
-                        
-                        for sel in title_selectors:
-                            elem = card.select_one(sel)
-                            if elem:
-                                title = elem.get_text(strip=True)
-                                break
-                        
-                        # Extract company
-                        company = None
-                        company_selectors = [
-                            'a.subTitle',
-                            '.company',
-                            '.companyInfo',
-                            '.comp-name',
-                            '.jobTupleHeader .subTitle'
-                        ]
-                        
-                        for sel in company_selectors:
-                            elem = card.select_one(sel)
-                            if elem:
-                                company = elem.get_text(strip=True)
-                                if company and len(company) < 80:
-                                    break
-                        
-                        # Extract link
-                        link = None
-                        link_elem = card.select_one('a.title, h3 a, h4 a')
-                        if link_elem and link_elem.get('href'):
-                            href = link_elem['href']
-                            if href.startswith('/'):
-                                link = f"https://www.naukri.com{href}"
-                            elif href.startswith('http'):
-                                link = href
-                        
-                        if title:
-                            jobs.append({
-                                "title": title,
-                                "company": company or "Naukri Partner Company",
-                                "link": link or f"https://www.naukri.com/{formatted_query}",
-                                "source": "Naukri",
-                                "query_used": query
-                            })
-                            
+                        results[tasks[task]] = task.result()
+                        found += min(len(results[tasks[task]]), limit)
                     except Exception as e:
-                        logger.error(f"Error parsing Naukri job: {e}")
-                        continue
-            
-            time.sleep(random.uniform(1, 3))
-            
-            if len(jobs) >= limit:
-                break
-                
-        except Exception as e:
-            logger.error(f"Error scraping Naukri for '{query}': {e}")
+                        logger.error(f"Error in {portal} query: {e}")
+        finally:
+            # Unlike threads, outstanding fetches can be stopped right away
+            for task in pending:
+                task.cancel()
     
-    return jobs[:limit]
+    return _jobs_in_query_order(results, queries, limit)
 
-def scrape_indeed_jobs(skills, limit=6):
-    """Scrape Indeed jobs based on extracted skills"""
-    jobs = []
-    
+async def scrape_portal_jobs_async(portal, skills, limit=6, deadline=None):
+    """Async scrape_<portal>_jobs for any portal in PORTAL_SCRAPERS"""
     if not skills:
-        return jobs
+        return []
     
-    search_queries = [f"{skill} developer" for skill in skills[:3]]
+    build_queries = PORTAL_SCRAPERS[portal][0]
+    with PORTAL_SCRAPE_SECONDS.time(portal):
+        return await _scrape_queries_async(portal, build_queries(skills), limit, deadline)
+
+async def scrape_all_jobs_async(skills, deadline_seconds=None, on_portal_done=None, truncated=None):
+    """Async scrape_all_jobs: same deadline, callbacks, truncation and ranking, on the running event loop
     
-    for query in search_queries:
-        try:
-            encoded_query = quote_plus(query)
-            url = f"https://in.indeed.com/jobs?q={encoded_query}&l=India"
-            
-            logger.info(f"Scraping Indeed: {query}")
-            response = safe_request(url)
-            
-            if response:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Try multiple selectors
-                job_cards = []
-                selectors = [
-                    'div[data-result-id]',
-                    'div.job_seen_beacon',
-                    'td.resultContent',
-                    'div.slider_container'
-                ]
-                
-                for selector in selectors:
-                    job_cards = soup.select(selector)[:limit]
-                    if job_cards:
-                        logger.info(f"Found {len(job_cards)} Indeed jobs")
-                        break
-                
-                for card in job_cards:
-                    try:
-                        # Extract title
-                        title = None
-                        title_selectors = [
-                            'h2 a span[title]',
-                            'h2.jobTitle a span',
-                            '.jobTitle a',
-                            'h2 span[title]'
-                        ]
-                        
-                        for sel in title_selectors:
-                            elem = card.select_one(sel)
-                            if elem:
-                                title = elem.get('title') or elem.get_text(strip=True)
-                                break
-                        
-                        # Extract company
-                        company = None
-                        company_selectors = [
-                            'span.companyName',
-                            '.companyName',
-                            'span[data-testid="company-name"]',
-                            '.company'
-                        ]
-                        
-                        for sel in company_selectors:
-                            elem = card.select_one(sel)
-                            if elem:
-                                company = elem.get_text(strip=True)
-                                break
-                        
-                        # Extract link
-                        link = None
-                        link_elem = card.select_one('h2 a, .jobTitle a')
-                        if link_elem and link_elem.get('href'):
-                            href = link_elem['href']
-                            if href.startswith('/'):
-                                link = f"https://in.indeed.com{href}"
-                            elif href.startswith('http'):
-                                link = href
-                        
-                        if title:
-                            jobs.append({
-                                "title": title,
-                                "company": company or "Indeed Partner Company",
-                                "link": link or f"https://in.indeed.com/jobs?q={encoded_query}&l=India",
-                                "source": "Indeed",
-                                "query_used": query
-                            })
-                            
-                    except Exception as e:
-                        logger.error(f"Error parsing Indeed job: {e}")
-                        continue
-            
-            time.sleep(random.uniform(1, 3))
-            
-            if len(jobs) >= limit:
+    on_portal_done runs on the loop, so it must not block; it may return an
+    awaitable (e.g. from asyncio.to_thread), which is awaited. Deduplication and
+    ranking run on a thread.
+    """
+    logger.info(f"Starting async job scraping for skills: {skills[:5]}...")
+    
+    if deadline_seconds is None:
+        deadline_seconds = SCRAPE_DEADLINE_SECONDS
+    deadline = ScrapeDeadline(time.monotonic() + deadline_seconds)
+    collect_deadline = deadline + 1
+    
+    tasks = {
+        asyncio.ensure_future(scrape_portal_jobs_async(portal, skills, RANK_CANDIDATES_PER_PORTAL, deadline)): portal
+        for portal in PORTAL_SCRAPERS
+    }
+    
+    portal_jobs = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=_time_left(collect_deadline), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
                 break
-                
-        except Exception as e:
-            logger.error(f"Error scraping Indeed for '{query}': {e}")
+            for task in done:
+                portal = tasks[task]
+                # A portal returning at the deadline, or unable to fit requests into it, stopped with queries outstanding
+                if truncated is not None and _portal_truncated(portal, deadline):
+                    truncated.append(portal)
+                try:
+                    jobs = task.result()
+                    portal_jobs[portal] = jobs
+                    logger.info(f"{portal}: Found {len(jobs)} jobs")
+                except Exception as e:
+                    logger.error(f"Error in {portal} scraper: {e}")
+                    jobs = []
+                if on_portal_done:
+                    result = on_portal_done(portal, jobs)
+                    if inspect.isawaitable(result):
+                        await result
+    finally:
+        for task in pending:
+            task.cancel()
     
-    return jobs[:limit]
+    for task in pending:
+        logger.warning(f"{tasks[task]}: no results before the deadline")
+        if truncated is not None:
+            truncated.append(tasks[task])
+    
+    return await asyncio.to_thread(_merge_portal_jobs, portal_jobs, skills)
 
-def scrape_all_jobs(skills):
-    """Scrape jobs from all portals based on extracted skills"""
-    logger.info(f"Starting job scraping for skills: {skills[:5]}...")
+# -----------------------------
+# Local Job Index
+# -----------------------------
+class JobIndex:
+    """SQLite job store with an inverted index from skill to job, filled by crawler.py"""
     
-    all_jobs = []
+    def __init__(self, path, reload_seconds=30):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._local = threading.local()
+        self._reload_lock = threading.Lock()
+        self._checked_at = None
+        self._version = None
+        # In-memory copy of the skill -> job postings that searches run against
+        self._postings = {}
+        self._crawled_at = {}
+        self._connect()
     
-    # Scrape from each portal
-    scrapers = [
-        ("Internshala", scrape_internshala_jobs),
-        ("Naukri", scrape_naukri_jobs),
-        ("Indeed", scrape_indeed_jobs)
-    ]
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id INTEGER PRIMARY KEY, job_key TEXT NOT NULL UNIQUE, title TEXT NOT NULL, company TEXT NOT NULL, "
+                "link TEXT, source TEXT, query_used TEXT, description TEXT, crawled_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_skills ("
+                "skill TEXT NOT NULL, job_id INTEGER NOT NULL, PRIMARY KEY (skill, job_id)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS job_skills_job ON job_skills (job_id)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_state ("
+                "skill TEXT PRIMARY KEY, crawled_at REAL NOT NULL, jobs_found INTEGER NOT NULL)"
+            )
+            # Bumped on every write so readers know when to reload their postings
+            conn.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+    
+    @staticmethod
+    def job_key(job):
+        return f"{normalize_job_title(job['title'])}\x1f{normalize_company(job['company'])}"
     
-    for scraper_name, scraper_func in scrapers:
+    @staticmethod
+    def _bump_version(conn):
+        conn.execute(
+            "INSERT INTO index_meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+    
+    def add_jobs(self, jobs, skill=None):
+        """Insert or refresh jobs, indexing each under the skills its text mentions"""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            for job in jobs:
+                description = job.get("desc") or job.get("description") or ""
+                job_skills = set(score_skills_in_text(f"{job['title']} {description}".lower()))
+                if skill:
+                    job_skills.add(skill)
+                # Upsert keeps the row id, so postings from earlier crawls stay attached
+                key = self.job_key(job)
+                conn.execute(
+                    "INSERT INTO jobs (job_key, title, company, link, source, query_used, description, crawled_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (job_key) DO UPDATE SET title = excluded.title, company = excluded.company, "
+                    "link = excluded.link, source = excluded.source, query_used = excluded.query_used, "
+                    "description = excluded.description, crawled_at = excluded.crawled_at",
+                    (key, job["title"], job["company"], job.get("link"), job.get("source"),
+                     job.get("query_used"), description, now)
+                )
+                job_id = conn.execute("SELECT id FROM jobs WHERE job_key = ?", (key,)).fetchone()[0]
+                conn.executemany(
+                    "INSERT OR IGNORE INTO job_skills (skill, job_id) VALUES (?, ?)",
+                    [(job_skill, job_id) for job_skill in job_skills]
+                )
+            self._bump_version(conn)
+    
+    def record_crawl(self, skill, jobs_found):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO crawl_state (skill, crawled_at, jobs_found) VALUES (?, ?, ?)",
+                (skill, time.time(), jobs_found)
+            )
+    
+    def crawl_order(self, skills):
+        """Skills ordered never-crawled first, then by oldest crawl"""
+        crawled_at = dict(self._connect().execute("SELECT skill, crawled_at FROM crawl_state").fetchall())
+        return sorted(skills, key=lambda skill: crawled_at.get(skill, 0.0))
+    
+    def _refresh_postings(self):
+        """Reload the in-memory postings if the database changed since the last check"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.reload_seconds:
+            return
+        with self._reload_lock:
+            if self._checked_at is not None and now - self._checked_at < self.reload_seconds:
+                return
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM index_meta WHERE key = 'version'").fetchone()
+            version = row[0] if row else 0
+            if version != self._version:
+                postings = {}
+                for skill, job_id in conn.execute("SELECT skill, job_id FROM job_skills"):
+                    postings.setdefault(skill, []).append(job_id)
+                self._crawled_at = dict(conn.execute("SELECT id, crawled_at FROM jobs"))
+                self._postings = postings
+                self._version = version
+            self._checked_at = now
+    
+    def search(self, skills, limit=15, max_age=None):
+        """Jobs indexed under the most of these skills, most recently crawled first on ties"""
+        if not skills:
+            return []
         try:
-            logger.info(f"Scraping {scraper_name}...")
-            jobs = scraper_func(skills, 6)  # Get 6 jobs from each portal
-            all_jobs.extend(jobs)
-            logger.info(f"{scraper_name}: Found {len(jobs)} jobs")
-            
-            # Delay between scrapers
-            time.sleep(random.uniform(2, 4))
-            
-        except Exception as e:
-            logger.error(f"Error in {scraper_name} scraper: {e}")
+            self._refresh_postings()
+        except sqlite3.Error as e:
+            logger.warning(f"Job index reload failed: {e}")
+        postings, crawled_at = self._postings, self._crawled_at
+        
+        cutoff = time.time() - (JOB_INDEX_MAX_AGE_SECONDS if max_age is None else max_age)
+        matched = {}
+        for skill in dict.fromkeys(skills):
+            for job_id in postings.get(skill, ()):
+                matched.setdefault(job_id, []).append(skill)
+        best = heapq.nlargest(
+            limit,
+            (job_id for job_id in matched if crawled_at.get(job_id, 0.0) > cutoff),
+            key=lambda job_id: (len(matched[job_id]), crawled_at[job_id])
+        )
+        if not best:
+            return []
+        
+        try:
+            rows = self._connect().execute(
+                f"SELECT id, title, company, link, source, query_used FROM jobs WHERE id IN ({','.join('?' * len(best))})",
+                best
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Job index search failed: {e}")
+            return []
+        by_id = {row[0]: row for row in rows}
+        return [
+            {
+                "title": by_id[job_id][1],
+                "company": by_id[job_id][2],
+                "link": by_id[job_id][3],
+                "source": by_id[job_id][4],
+                "query_used": by_id[job_id][5],
+                "matched_skills": sorted(matched[job_id])
+            }
+            for job_id in best
+            if job_id in by_id  # Purged since the postings were loaded
+        ]
+    
+    def purge(self, max_age=None):
+        """Drop listings not seen by the crawler within max_age seconds"""
+        cutoff = time.time() - (JOB_INDEX_MAX_AGE_SECONDS if max_age is None else max_age)
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM job_skills WHERE job_id IN (SELECT id FROM jobs WHERE crawled_at <= ?)", (cutoff,))
+            removed = conn.execute("DELETE FROM jobs WHERE crawled_at <= ?", (cutoff,)).rowcount
+            if removed:
+                self._bump_version(conn)
+        return removed
+    
+    def stats(self):
+        try:
+            conn = self._connect()
+            jobs = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            crawled, last_crawl = conn.execute("SELECT COUNT(*), MAX(crawled_at) FROM crawl_state").fetchone()
+        except sqlite3.Error as e:
+            return {"path": self.path, "error": str(e)}
+        return {
+            "path": self.path,
+            "jobs": jobs,
+            "skills_indexed": len(self._postings),
+            "skills_crawled": crawled,
+            "last_crawl_age_s": round(time.time() - last_crawl, 1) if last_crawl else None
+        }
+
+def _open_job_index(path):
+    """Open the local job index, or None when disabled or unavailable"""
+    if not path:
+        return None
+    try:
+        return JobIndex(path)
+    except sqlite3.Error as e:
+        logger.warning(f"Job index unavailable ({path}): {e}")
+        return None
+
+JOB_INDEX = _open_job_index(JOB_INDEX_DB)
+
+@STAGE_SECONDS.timed("job_index")
+def find_indexed_jobs(skills, limit=15):
+    """Jobs for these skills from the crawled index, or [] if it can't answer well enough"""
+    if JOB_INDEX is None:
+        return []
+    # Over-fetch by skill overlap, then let the weighted ranking pick the best
+    jobs = deduplicate_jobs(JOB_INDEX.search(skills, limit * 4))
+    if len(jobs) < min(JOB_INDEX_MIN_RESULTS, limit):
+        return []
+    logger.info(f"Answered from job index: {len(jobs)} candidates")
+    return rank_jobs(jobs, skills, limit=limit)
+
+# -----------------------------
+# Background Scrape Jobs
+# -----------------------------
+class ScrapeJobRegistry:
+    """Tracks background scrapes started by /upload so clients can poll for results
     
-    # Remove duplicates based on title and company
-    seen_jobs = set()
-    unique_jobs = []
+    State lives in memory and is mirrored to the shared store, when configured,
+    so a poll answered by a different gunicorn worker still finds the job.
+    """
     
-    for job in all_jobs:
-        job_key = (job['title'].lower().strip(), job['company'].lower().strip())
-        if job_key not in seen_jobs:
-            seen_jobs.add(job_key)
-            unique_jobs.append(job)
+    def __init__(self, max_workers, ttl, store=None):
+        self.ttl = ttl
+        self.store = store
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self._tasks = set()
     
-    logger.info(f"Total unique jobs found: {len(unique_jobs)}")
-    return unique_jobs[:15]  # Return top 15 jobs
+    def submit(self, skills, deadline_seconds=None, loop=None):
+        """Start scraping in the background, as a task on loop if given, and return the new job's ID"""
+        job_id = uuid.uuid4().hex
+        # Writes to the store, so asgi.py calls this from a thread
+        now = time.time()
+        self._save({
+            "job_id": job_id,
+            "status": "running",
+            "portals_completed": [],
+            "truncated_portals": [],
+            "job_listings": [],
+            "jobs_count": 0,
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        })
+        if loop is None:
+            self._executor.submit(self._run, job_id, skills, deadline_seconds)
+        else:
+            # A task on the server's loop rather than one of the pool's threads
+            loop.call_soon_threadsafe(self._start_task, loop, job_id, skills, deadline_seconds)
+        return job_id
+    
+    def _start_task(self, loop, job_id, skills, deadline_seconds):
+        # The loop only keeps weak references to tasks
+        task = loop.create_task(self._run_async(job_id, skills, deadline_seconds))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def get(self, job_id):
+        with self._lock:
+            state = self._jobs.get(job_id)
+            if state is not None:
+                return dict(state)
+        if self.store is not None:
+            return self.store.get_scrape_job(job_id)
+        return None
+    
+    def _save(self, state):
+        state["updated_at"] = time.time()
+        with self._lock:
+            self._jobs[state["job_id"]] = dict(state)
+            # Forget finished jobs once nobody can reasonably still be polling
+            cutoff = time.time() - self.ttl
+            for job_id in [j for j, s in self._jobs.items() if s["updated_at"] < cutoff]:
+                del self._jobs[job_id]
+        if self.store is not None:
+            self.store.set_scrape_job(state["job_id"], state, state["updated_at"] + self.ttl)
+    
+    def _progress_callback(self, state, skills):
+        """on_portal_done callback publishing the ranked jobs found so far"""
+        partial_jobs = []
+        
+        def on_portal_done(portal_name, jobs):
+            partial_jobs.extend(jobs)
+            state["portals_completed"].append(portal_name)
+            state["job_listings"] = rank_jobs(deduplicate_jobs(partial_jobs), skills, limit=15)
+            state["jobs_count"] = len(state["job_listings"])
+            self._save(state)
+        return on_portal_done
+    
+    def _finish(self, state, job_opportunities):
+        state["job_listings"] = job_opportunities
+        state["jobs_count"] = len(job_opportunities)
+        state["status"] = "completed"
+        self._save(state)
+    
+    def _fail(self, state, error):
+        logger.error(f"Error in background scrape {state['job_id']}: {error}")
+        state["status"] = "failed"
+        state["error"] = str(error)
+        self._save(state)
+    
+    def _run(self, job_id, skills, deadline_seconds):
+        state = self.get(job_id)
+        try:
+            job_opportunities = scrape_all_jobs(
+                skills, deadline_seconds,
+                on_portal_done=self._progress_callback(state, skills), truncated=state["truncated_portals"]
+            )
+        except Exception as e:
+            self._fail(state, e)
+            return
+        self._finish(state, job_opportunities)
+    
+    async def _run_async(self, job_id, skills, deadline_seconds):
+        # Ranking and saving to the store happen on threads, off the event loop
+        state = await asyncio.to_thread(self.get, job_id)
+        progress = self._progress_callback(state, skills)
+        try:
+            job_opportunities = await scrape_all_jobs_async(
+                skills, deadline_seconds,
+                on_portal_done=lambda portal_name, jobs: asyncio.to_thread(progress, portal_name, jobs),
+                truncated=state["truncated_portals"]
+            )
+        except Exception as e:
+            await asyncio.to_thread(self._fail, state, e)
+            return
+        await asyncio.to_thread(self._finish, state, job_opportunities)
+
+SCRAPE_JOBS = ScrapeJobRegistry(SCRAPE_JOB_WORKERS, SCRAPE_JOB_TTL_SECONDS, store=JOB_CACHE.store)
 
 # -----------------------------
 # Flask Routes
 # -----------------------------
+@app.before_request
+def _track_request_start():
+    global _in_flight_requests
+    with _in_flight_lock:
+        _in_flight_requests += 1
+
+@app.teardown_request
+def _track_request_end(exc):
+    global _in_flight_requests
+    with _in_flight_lock:
+        _in_flight_requests -= 1
+
 @app.route("/")
 def home():
     """Render the main application page"""
     return render_template("index.html")
 
-@app.route("/upload", methods=["POST"])
-def upload_resume():
-    """Handle resume upload and job matching"""
+def _extract_uploaded_skills():
+    """Validate the uploaded resume and extract its skills
+    
+    Returns (skills, None) on success or (None, error_response) for the route to return.
+    """
+    # Validate file upload
+    if "resume" not in request.files:
+        return None, (jsonify({"error": "No file uploaded"}), 400)
+    
+    file = request.files["resume"]
+    if file.filename == "":
+        return None, (jsonify({"error": "No file selected"}), 400)
+    
+    if not file.filename.lower().endswith('.pdf'):
+        return None, (jsonify({"error": "Only PDF files are supported"}), 400)
+    
+    filename = secure_filename(file.filename)
+    logger.info(f"Processing resume: {filename}")
+    
+    # Extract skills straight from the upload stream; nothing is written under UPLOAD_FOLDER
+    logger.info("Extracting skills from resume PDF...")
+    skills = extract_skills_from_resume(file.stream)
+    
+    if not skills:
+        return None, (jsonify({
+            "error": "No technical skills found in your resume",
+            "suggestion": "Make sure your resume includes technical skills like programming languages (Python, Java), frameworks (React, Django), databases (SQL, MongoDB), or tools (Git, Docker). Use standard skill names and include a 'Skills' or 'Technical Skills' section."
+        }), 400)
+    
+    logger.info(f"Extracted {len(skills)} skills from resume")
+    return skills, None
+
+def _parse_time_budget(value):
+    """Validate a client's time budget in seconds, capped at SCRAPE_DEADLINE_SECONDS (None if not given)"""
+    if value is None or value == "":
+        return None
+    budget = float(value)
+    if not budget > 0:
+        raise ValueError("time_budget must be positive")
+    return min(budget, SCRAPE_DEADLINE_SECONDS)
+
+def _remaining_budget(time_budget, started):
+    """Seconds of a request's time budget left for scraping (None means the default deadline)"""
+    if time_budget is None:
+        return None
+    return max(0.0, time_budget - (time.monotonic() - started))
+
+def _upload_error_response(e):
+    logger.error(f"Error processing resume: {str(e)}")
+    return jsonify({
+        "error": "An error occurred while processing your resume",
+        "details": str(e) if app.debug else "Please try again with a different PDF file"
+    }), 500
+
+def _begin_upload():
+    """Shared start of /upload and /upload/stream: parse the time budget, extract skills, match roles
+    
+    Returns (upload, None) where upload holds the request's start time, time budget,
+    skills and role matches, or (None, error_response) for the route to return.
+    """
+    started = time.monotonic()
     try:
-        # Validate file upload
-        if "resume" not in request.files:
-            return jsonify({"error": "No file uploaded"}), 400
-        
-        file = request.files["resume"]
-        if file.filename == "":
-            return jsonify({"error": "No file selected"}), 400
-        
-        if not file.filename.lower().endswith('.pdf'):
-            return jsonify({"error": "Only PDF files are supported"}), 400
-        
-        # Save the uploaded file
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-        file.save(file_path)
-        
-        logger.info(f"Processing resume: {filename}")
-        
-        # Extract skills from the resume
-        logger.info("Extracting skills from resume PDF...")
-        skills = extract_skills_from_resume(file_path)
-        
-        if not skills:
-            # Clean up file
-            try:
-                os.remove(file_path)
-            except:
-                pass
-            return jsonify({
-                "error": "No technical skills found in your resume",
-                "suggestion": "Make sure your resume includes technical skills like programming languages (Python, Java), frameworks (React, Django), databases (SQL, MongoDB), or tools (Git, Docker). Use standard skill names and include a 'Skills' or 'Technical Skills' section."
-            }), 400
-        
-        logger.info(f"Extracted {len(skills)} skills from resume")
+        time_budget = _parse_time_budget(request.args.get("time_budget", request.form.get("time_budget")))
+    except (TypeError, ValueError):
+        return None, (jsonify({"error": "time_budget must be a positive number of seconds"}), 400)
+    
+    try:
+        skills, error_response = _extract_uploaded_skills()
+        if error_response:
+            return None, error_response
         
         # Match job roles based on extracted skills
         logger.info("Matching job roles...")
         role_matches = match_job_roles(skills)
-        
-        # Scrape job opportunities based on extracted skills
-        logger.info("Scraping job opportunities based on your skills...")
-        job_opportunities = scrape_all_jobs(skills)
-        
-        # Clean up the uploaded file
-        try:
-            os.remove(file_path)
-        except:
-            pass
-        
-        # Prepare response
-        response_data = {
-            "success": True,
-            "skills": skills[:25],  # Show up to 25 skills
-            "skills_count": len(skills),
-            "role_matches": role_matches,
-            "job_listings": job_opportunities,
-            "jobs_count": len(job_opportunities),
-            "message": f"Successfully analyzed your resume! Found {len(skills)} technical skills and {len(job_opportunities)} relevant job opportunities.",
-            "top_skills": skills[:10],  # Top 10 skills for summary
-            "processing_info": {
-                "total_skills_detected": len(skills),
-                "job_roles_matched": len(role_matches),
-                "portals_searched": ["Internshala", "Naukri", "Indeed"],
-                "search_queries_used": len(set([skill.lower() for skill in skills[:3]]))
-            }
+    except Exception as e:
+        return None, _upload_error_response(e)
+    
+    return {
+        "started": started,
+        "time_budget": time_budget,
+        "skills": skills,
+        "role_matches": role_matches
+    }, None
+
+def _upload_response(upload, job_opportunities, job_id=None, truncated_portals=()):
+    """The /upload JSON response; with a job_id, jobs are still being scraped in the background"""
+    skills = upload["skills"]
+    role_matches = upload["role_matches"]
+    if job_id:
+        message = f"Successfully analyzed your resume! Found {len(skills)} technical skills. Searching job portals..."
+    else:
+        message = f"Successfully analyzed your resume! Found {len(skills)} technical skills and {len(job_opportunities)} relevant job opportunities."
+    
+    # Prepare response
+    response_data = {
+        "success": True,
+        "skills": skills[:25],  # Show up to 25 skills
+        "skills_count": len(skills),
+        "role_matches": role_matches,
+        "job_listings": job_opportunities,
+        "jobs_count": len(job_opportunities),
+        "job_id": job_id,
+        "jobs_status": "running" if job_id else "completed",
+        "truncated_portals": list(truncated_portals),
+        "status_url": url_for("get_scrape_job", job_id=job_id) if job_id else None,
+        "message": message,
+        "top_skills": skills[:10],  # Top 10 skills for summary
+        "processing_info": {
+            "total_skills_detected": len(skills),
+            "job_roles_matched": len(role_matches),
+            "portals_searched": ["Internshala", "Naukri", "Indeed"],
+            "search_queries_used": len(set([skill.lower() for skill in skills[:3]]))
         }
+    }
+    
+    logger.info(f"Successfully processed resume - {len(skills)} skills, {len(job_opportunities)} jobs")
+    return jsonify(response_data)
+
+@app.route("/upload", methods=["POST"])
+def upload_resume():
+    """Handle resume upload and job matching
+    
+    ?time_budget=<seconds> (or a form field) bounds the whole request including
+    scraping; portals still running when it expires are listed in truncated_portals.
+    """
+    upload, error_response = _begin_upload()
+    if error_response:
+        return error_response
+    
+    try:
+        skills = upload["skills"]
         
-        logger.info(f"Successfully processed resume - {len(skills)} skills, {len(job_opportunities)} jobs")
-        return jsonify(response_data)
+        # Answer from the crawled job index when it covers these skills. Otherwise scrape
+        # in the background and the client polls status_url; ?wait=true keeps the one-shot response.
+        wait_for_jobs = request.args.get("wait", "false").lower() == "true"
+        truncated_portals = []
+        job_id = None
+        job_opportunities = find_indexed_jobs(skills)
+        if not job_opportunities and wait_for_jobs:
+            logger.info("Scraping job opportunities based on your skills...")
+            job_opportunities = scrape_all_jobs(
+                skills, _remaining_budget(upload["time_budget"], upload["started"]), truncated=truncated_portals
+            )
+        elif not job_opportunities:
+            job_id = SCRAPE_JOBS.submit(skills, _remaining_budget(upload["time_budget"], upload["started"]))
+            logger.info(f"Scraping job opportunities in background job {job_id}")
+        
+        return _upload_response(upload, job_opportunities, job_id, truncated_portals)
         
     except Exception as e:
-        # Clean up file on error
+        return _upload_error_response(e)
+
+def _sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _sse_response(events):
+    return Response(events, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Stop proxies from buffering the stream
+    })
+
+class UploadStream:
+    """Formats the /upload/stream events: skills first, then each portal's new jobs, then done"""
+    
+    def __init__(self, skills, role_matches, indexed=False):
+        self.skills = skills
+        self.role_matches = role_matches
+        # Deduplicate incrementally across portals and send each portal's most relevant
+        # jobs, capped like scrape_all_jobs; an index answer comes as one batch
+        self.batch_limit = 15 if indexed else 6
+        self.seen_jobs = JobDeduplicator()
+        self.jobs_sent = 0
+    
+    def skills_event(self):
+        return _sse_event("skills", {
+            "success": True,
+            "skills": self.skills[:25],  # Show up to 25 skills
+            "skills_count": len(self.skills),
+            "role_matches": self.role_matches,
+            "job_listings": [],
+            "jobs_count": 0,
+            "jobs_status": "running",
+            "message": f"Successfully analyzed your resume! Found {len(self.skills)} technical skills. Searching job portals...",
+            "top_skills": self.skills[:10]
+        })
+    
+    def jobs_event(self, portal_name, jobs):
+        new_jobs = rank_jobs(deduplicate_jobs(jobs, self.seen_jobs), self.skills, limit=self.batch_limit)
+        new_jobs = new_jobs[:max(15 - self.jobs_sent, 0)]
+        self.jobs_sent += len(new_jobs)
+        return _sse_event("jobs", {
+            "portal": portal_name,
+            "job_listings": new_jobs,
+            "jobs_count": self.jobs_sent
+        })
+    
+    def done_event(self, truncated_portals):
+        logger.info(f"Successfully streamed resume results - {len(self.skills)} skills, {self.jobs_sent} jobs")
+        return _sse_event("done", {
+            "jobs_count": self.jobs_sent,
+            "truncated_portals": truncated_portals,
+            "message": f"Successfully analyzed your resume! Found {len(self.skills)} technical skills and {self.jobs_sent} relevant job opportunities."
+        })
+
+@app.route("/upload/stream", methods=["POST"])
+def upload_resume_stream():
+    """Handle resume upload, streaming skills and role matches first and then each portal's jobs as Server-Sent Events"""
+    upload, error_response = _begin_upload()
+    if error_response:
+        return error_response
+    skills = upload["skills"]
+    
+    # Portals report into the queue as they finish; None marks the end of the scrape.
+    # Jobs from the crawled index arrive as a single batch without scraping.
+    portal_results = queue.Queue()
+    truncated_portals = []
+    indexed_jobs = find_indexed_jobs(skills)
+    
+    def run_scrape():
         try:
-            if 'file_path' in locals():
-                os.remove(file_path)
-        except:
-            pass
-        
-        logger.error(f"Error processing resume: {str(e)}")
+            scrape_all_jobs(
+                skills, _remaining_budget(upload["time_budget"], upload["started"]),
+                on_portal_done=lambda name, jobs: portal_results.put((name, jobs)),
+                truncated=truncated_portals
+            )
+        except Exception as e:
+            logger.error(f"Error streaming job scrape: {e}")
+        finally:
+            portal_results.put(None)
+    
+    if indexed_jobs:
+        portal_results.put(("Job Index", indexed_jobs))
+        portal_results.put(None)
+    else:
+        threading.Thread(target=run_scrape, name="scrape-stream", daemon=True).start()
+    
+    stream = UploadStream(skills, upload["role_matches"], indexed=bool(indexed_jobs))
+    
+    def generate():
+        yield stream.skills_event()
+        while True:
+            result = portal_results.get()
+            if result is None:
+                break
+            yield stream.jobs_event(*result)
+        yield stream.done_event(truncated_portals)
+    
+    return _sse_response(generate())
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_scrape_job(job_id):
+    """Report partial or final job listings for a background scrape started by /upload"""
+    state = SCRAPE_JOBS.get(job_id)
+    if state is None:
         return jsonify({
-            "error": "An error occurred while processing your resume",
-            "details": str(e) if app.debug else "Please try again with a different PDF file"
-        }), 500
+            "error": "Job not found",
+            "message": "The job ID is unknown or its results have expired"
+        }), 404
+    
+    return jsonify({
+        "success": state["status"] != "failed",
+        "job_id": job_id,
+        "status": state["status"],
+        "portals_completed": state["portals_completed"],
+        "truncated_portals": state.get("truncated_portals", []),
+        "job_listings": state["job_listings"],
+        "jobs_count": state["jobs_count"],
+        "error": state["error"]
+    })
 
 @app.route("/api/skills", methods=["GET"])
 def get_available_skills():
-    """Return all available skills in the database"""
-    skills_by_category = {
-        "Programming Languages": PROGRAMMING_LANGUAGES,
-        "Web Technologies": WEB_TECHNOLOGIES,
-        "Databases": DATABASES,
-        "Data Science & AI": DATA_SCIENCE_AI,
-        "Cloud & DevOps": CLOUD_DEVOPS,
-        "Mobile Technologies": MOBILE_TECHNOLOGIES,
-        "Other Skills": OTHER_SKILLS
-    }
+    """Return all available skills in the database, or resolve ?q= to its canonical skill"""
+    query = request.args.get("q")
+    if query is not None:
+        skill = canonical_skill(query)
+        return jsonify({
+            "success": skill is not None,
+            "query": query,
+            "skill": skill,
+            "category": SKILL_CATEGORY.get(skill)
+        })
     
     return jsonify({
         "success": True,
-        "skills_by_category": skills_by_category,
+        "skills_by_category": SKILL_CATEGORIES,
+        "category_sizes": CATEGORY_SIZES,
         "total_skills": len(ALL_SKILLS)
     })
 
+def _analysis_error_response(e):
+    logger.error(f"Error in analyze_skills: {str(e)}")
+    return jsonify({
+        "error": "An error occurred during analysis",
+        "details": str(e) if app.debug else "Please try again"
+    }), 500
+
+def _begin_analysis():
+    """Validate an /api/analyze body and match roles
+    
+    Returns (analysis, None) or (None, error_response) for the route to return.
+    """
+    started = time.monotonic()
+    data = request.get_json()
+    if not data or 'skills' not in data:
+        return None, (jsonify({"error": "No skills provided"}), 400)
+    
+    skills = data['skills']
+    if not isinstance(skills, list) or not skills:
+        return None, (jsonify({"error": "Skills must be a non-empty list"}), 400)
+    
+    # Validate skills (case-insensitive, aliases like "nodejs" accepted)
+    valid_skills = canonicalize_skills(skills)
+    if not valid_skills:
+        return None, (jsonify({"error": "No valid skills provided"}), 400)
+    
+    try:
+        time_budget = _parse_time_budget(data.get('time_budget'))
+    except (TypeError, ValueError):
+        return None, (jsonify({"error": "time_budget must be a positive number of seconds"}), 400)
+    
+    return {
+        "started": started,
+        "time_budget": time_budget,
+        "skills": valid_skills,
+        "role_matches": match_job_roles(valid_skills),
+        # Optionally scrape jobs (can be disabled for API usage)
+        "include_jobs": data.get('include_jobs', False)
+    }, None
+
+def _analysis_response(analysis, job_opportunities, truncated_portals):
+    return jsonify({
+        "success": True,
+        "skills": analysis["skills"],
+        "skills_count": len(analysis["skills"]),
+        "role_matches": analysis["role_matches"],
+        "job_listings": job_opportunities,
+        "jobs_count": len(job_opportunities),
+        "truncated_portals": truncated_portals
+    })
+
 @app.route("/api/analyze", methods=["POST"])
 def analyze_skills():
-    """Analyze provided skills and return job matches"""
+    """Analyze provided skills and return job matches
+    
+    An optional "time_budget" (seconds) bounds job scraping; portals cut short
+    are listed in truncated_portals.
+    """
     try:
-        data = request.get_json()
-        if not data or 'skills' not in data:
-            return jsonify({"error": "No skills provided"}), 400
-        
-        skills = data['skills']
-        if not isinstance(skills, list) or not skills:
-            return jsonify({"error": "Skills must be a non-empty list"}), 400
-        
-        # Validate skills
-        valid_skills = [skill for skill in skills if skill in ALL_SKILLS]
-        if not valid_skills:
-            return jsonify({"error": "No valid skills provided"}), 400
+        analysis, error_response = _begin_analysis()
+        if error_response:
+            return error_response
         
-        # Match job roles
-        role_matches = match_job_roles(valid_skills)
-        
-        # Optionally scrape jobs (can be disabled for API usage)
-        include_jobs = data.get('include_jobs', False)
         job_opportunities = []
+        truncated_portals = []
+        if analysis["include_jobs"]:
+            job_opportunities = find_indexed_jobs(analysis["skills"]) or scrape_all_jobs(
+                analysis["skills"], _remaining_budget(analysis["time_budget"], analysis["started"]),
+                truncated=truncated_portals
+            )
         
-        if include_jobs:
-            job_opportunities = scrape_all_jobs(valid_skills)
-        
-        response_data = {
-            "success": True,
-            "skills": valid_skills,
-            "skills_count": len(valid_skills),
-            "role_matches": role_matches,
-            "job_listings": job_opportunities,
-            "jobs_count": len(job_opportunities)
-        }
-        
-        return jsonify(response_data)
+        return _analysis_response(analysis, job_opportunities, truncated_portals)
         
     except Exception as e:
-        logger.error(f"Error in analyze_skills: {str(e)}")
-        return jsonify({
-            "error": "An error occurred during analysis",
-            "details": str(e) if app.debug else "Please try again"
-        }), 500
+        return _analysis_error_response(e)
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Expose latency histograms, cache hit rates and in-flight requests in Prometheus text format"""
+    lines = []
+    for histogram in (STAGE_SECONDS, PORTAL_SCRAPE_SECONDS, HTTP_FETCH_SECONDS):
+        lines.extend(histogram.render())
+    
+    def add_metric(name, help_text, samples, metric_type="gauge"):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            label_text = "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}" if labels else ""
+            lines.append(f"{name}{label_text} {value}")
+    
+    with _in_flight_lock:
+        in_flight = _in_flight_requests
+    add_metric("http_requests_in_flight", "Requests currently being handled by this worker", [({}, in_flight)])
+    
+    job_cache = JOB_CACHE.stats()
+    resume_cache = RESUME_CACHE.stats()
+    add_metric("cache_lookups_total", "Cache lookups by cache and result", [
+        ({"cache": "job", "result": "hit"}, job_cache["hits"]),
+        ({"cache": "job", "result": "stale"}, job_cache["stale_hits"]),
+        ({"cache": "job", "result": "miss"}, job_cache["misses"]),
+        ({"cache": "resume", "result": "hit"}, resume_cache["hits"]),
+        ({"cache": "resume", "result": "miss"}, resume_cache["misses"])
+    ], metric_type="counter")
+    add_metric("cache_store_hits_total", "Job cache lookups answered by the shared store", [
+        ({"cache": "job"}, job_cache["store_hits"])
+    ], metric_type="counter")
+    
+    def hit_ratio(hits, total):
+        return round(hits / total, 4) if total else 0
+    
+    add_metric("cache_hit_ratio", "Share of cache lookups served from cache", [
+        ({"cache": "job"}, hit_ratio(job_cache["hits"] + job_cache["stale_hits"],
+                                     job_cache["hits"] + job_cache["stale_hits"] + job_cache["misses"])),
+        ({"cache": "resume"}, hit_ratio(resume_cache["hits"], resume_cache["hits"] + resume_cache["misses"]))
+    ])
+    add_metric("cache_entries", "Entries held in each in-process cache", [
+        ({"cache": "job"}, job_cache["entries"]),
+        ({"cache": "resume"}, resume_cache["entries"])
+    ])
+    
+    pools = get_http_pool_stats()
+    add_metric("http_pool_connections_total", "Outbound connections opened and reused per host", [
+        ({"host": host, "state": state}, stats[f"connections_{state}"])
+        for host, stats in sorted(pools.items())
+        for state in ("opened", "reused")
+    ], metric_type="counter")
+    
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
 
 @app.route("/api/health", methods=["GET"])
 def health_check():
@@ -884,7 +3315,15 @@ def health_check():
         "status": "healthy",
         "version": "1.0.0",
         "skills_loaded": len(ALL_SKILLS),
-        "upload_folder": app.config["UPLOAD_FOLDER"]
+        "upload_folder": app.config["UPLOAD_FOLDER"],
+        "http_pools": get_http_pool_stats(),
+        "job_cache": JOB_CACHE.stats(),
+        "resume_cache": RESUME_CACHE.stats(),
+        "job_index": JOB_INDEX.stats() if JOB_INDEX is not None else None,
+        "rate_limits": HOST_RATE_LIMITER.stats(),
+        "circuit_breakers": {breaker.name: breaker.stats() for breaker in PORTAL_BREAKERS.values()},
+        "html_parser": HTML_PARSER_BACKEND,
+        "selectors": SELECTOR_MEMORY.stats()
     })
 
 @app.errorhandler(413)
@@ -917,37 +3356,19 @@ def generate_skills_report(skills, role_matches):
         return {}
     
     # Categorize skills
-    categorized_skills = {
-        "Programming Languages": [],
-        "Web Technologies": [],
-        "Databases": [],
-        "Data Science & AI": [],
-        "Cloud & DevOps": [],
-        "Mobile Technologies": [],
-        "Other Skills": []
-    }
-    
-    skill_categories = {
-        "Programming Languages": PROGRAMMING_LANGUAGES,
-        "Web Technologies": WEB_TECHNOLOGIES,
-        "Databases": DATABASES,
-        "Data Science & AI": DATA_SCIENCE_AI,
-        "Cloud & DevOps": CLOUD_DEVOPS,
-        "Mobile Technologies": MOBILE_TECHNOLOGIES,
-        "Other Skills": OTHER_SKILLS
-    }
+    categorized_skills = {category: [] for category in SKILL_CATEGORIES}
     
     for skill in skills:
-        for category, category_skills in skill_categories.items():
-            if skill in category_skills:
-                categorized_skills[category].append(skill)
-                break
+        skill = canonical_skill(skill)
+        category = SKILL_CATEGORY.get(skill)
+        if category:
+            categorized_skills[category].append(skill)
     
     # Calculate category strengths
     category_strengths = {}
     for category, category_skills in categorized_skills.items():
         if category_skills:
-            total_possible = len(skill_categories[category])
+            total_possible = CATEGORY_SIZES[category]
             strength_score = (len(category_skills) / total_possible) * 100
             category_strengths[category] = {
                 "skills": category_skills,
@@ -995,9 +3416,8 @@ def generate_report():
             })
         
         # Skill gap analysis
-        all_skills_set = set(ALL_SKILLS)
-        user_skills_set = set(skills)
-        missing_skills = all_skills_set - user_skills_set
+        user_skills_set = set(canonicalize_skills(skills))
+        missing_skills = ALL_SKILLS_SET - user_skills_set
         
         # Suggest top missing skills for the best-matched role
         skill_suggestions = []
@@ -1029,6 +3449,66 @@ def generate_report():
             "details": str(e) if app.debug else "Please try again"
         }), 500
 
+@app.route("/api/analyze/batch", methods=["POST"])
+def analyze_batch():
+    """Analyze many candidates' skills in one call, streaming one NDJSON result line per candidate"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('candidates'), list):
+        return jsonify({"error": "Candidates must be provided as a list"}), 400
+    
+    candidates = data['candidates']
+    if not candidates:
+        return jsonify({"error": "Candidates must be a non-empty list"}), 400
+    if len(candidates) > BATCH_MAX_CANDIDATES:
+        return jsonify({
+            "error": "Too many candidates",
+            "message": f"Send at most {BATCH_MAX_CANDIDATES} candidates per request"
+        }), 413
+    
+    include_report = data.get('include_report', True)
+    if not isinstance(include_report, bool):
+        return jsonify({"error": "include_report must be true or false"}), 400
+    
+    def generate():
+        # Identical skill lists are common in ATS exports; score each distinct one once
+        results_by_skills = {}
+        
+        for index, candidate in enumerate(candidates):
+            candidate_id = candidate.get('id', index) if isinstance(candidate, dict) else index
+            skills = candidate.get('skills') if isinstance(candidate, dict) else None
+            line = {"index": index, "id": candidate_id}
+            
+            try:
+                if not isinstance(skills, list) or not skills:
+                    line["error"] = "Skills must be a non-empty list"
+                else:
+                    valid_skills = tuple(canonicalize_skills(skills))
+                    if not valid_skills:
+                        line["error"] = "No valid skills provided"
+                    else:
+                        result = results_by_skills.get(valid_skills)
+                        if result is None:
+                            role_matches = match_job_roles(list(valid_skills))
+                            result = {
+                                "success": True,
+                                "skills": list(valid_skills),
+                                "skills_count": len(valid_skills),
+                                "role_matches": role_matches
+                            }
+                            if include_report:
+                                result["skills_analysis"] = generate_skills_report(list(valid_skills), role_matches)
+                            results_by_skills[valid_skills] = result
+                        line.update(result)
+            except Exception as e:
+                logger.error(f"Error analyzing batch candidate {candidate_id}: {str(e)}")
+                line["error"] = "An error occurred during analysis"
+            
+            if "error" in line:
+                line["success"] = False
+            yield json.dumps(line) + "\n"
+    
+    return Response(generate(), mimetype="application/x-ndjson")
+
 # -----------------------------
 # Colab-specific setup and run function
 # -----------------------------
@@ -1064,7 +3544,7 @@ def run_colab_app():
         print(f"📝 Upload a PDF resume to get started!")
         print(f"\n⚡ Features:")
         print(f"  • Extract {len(ALL_SKILLS)} different technical skills")
-        print(f"  • Match to {len(job_roles)} job roles")
+        print(f"  • Match to {len(JOB_ROLES)} job roles")
         print(f"  • Search jobs on Internshala, Naukri, Indeed")
         print(f"\n🔗 Click the link above to open the app!")
         
@@ -0,0 +1,302 @@
+"""ASGI entry point that serves the scraping-bound endpoints from an event loop.
+
+Under gunicorn (app:app) an upload that waits on the job portals holds a worker
+thread for the whole scrape, mostly asleep in network waits. Here POST /upload,
+/upload/stream and /api/analyze are handled as coroutines: request parsing, PDF
+extraction, SQLite reads and writes, deduplication and ranking still run on
+threads, but the portals are scraped with the async scrapers in app.py, so one
+process can keep hundreds of uploads waiting on portals. Background scrapes
+started by /upload run as tasks on the same loop. Every other route is handed
+to the Flask app on a thread, unchanged.
+
+The Procfile serves it with gunicorn's uvicorn worker; locally (httpx is optional,
+without it live fetches run on threads):
+
+    pip install uvicorn httpx
+    uvicorn asgi:application --workers 2
+"""
+import asyncio
+import logging
+import sys
+import tempfile
+
+from flask import request
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from werkzeug.wrappers import Response
+
+import app
+
+logger = logging.getLogger("asgi")
+
+flask_app = app.app
+
+if app.httpx is None:
+    logger.warning("httpx is not installed; live portal fetches will run on threads")
+
+async def read_body(receive, limit):
+    """Collect the request body into a spooled file
+    
+    Returns (body, too_large), with too_large once it exceeds limit bytes, or
+    (None, False) if the client disconnected before sending all of it.
+    """
+    body = tempfile.SpooledTemporaryFile(max_size=app.UPLOAD_SPOOL_THRESHOLD)
+    size = 0
+    too_large = False
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            body.close()
+            return None, False
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if limit is not None and size > limit:
+            too_large = True
+            break
+        body.write(chunk)
+        if not message.get("more_body"):
+            break
+    body.seek(0)
+    return body, too_large
+
+async def wait_for_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+def build_environ(scope, body):
+    """WSGI environ for an ASGI HTTP request, so Flask's request handling can be reused"""
+    script_name = scope.get("root_path", "").encode("utf8").decode("latin1")
+    path_info = scope["path"].encode("utf8").decode("latin1")
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": script_name,
+        "PATH_INFO": path_info,
+        "QUERY_STRING": scope["query_string"].decode("ascii"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "REMOTE_ADDR": (scope.get("client") or ("",))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        # The whole body is buffered, so Werkzeug can read chunked requests without a Content-Length
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1")
+        if name == "content-length":
+            key = "CONTENT_LENGTH"
+        elif name == "content-type":
+            key = "CONTENT_TYPE"
+        else:
+            key = "HTTP_" + name.upper().replace("-", "_")
+        value = value.decode("latin1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+async def send_response(send, response, events=None, receive=None):
+    """Send a Flask response; with events (an async iterator of str), stream them as its body
+    
+    While streaming, receive is watched so the stream is cancelled if the client goes away.
+    """
+    headers = [
+        (name.lower().encode("latin1"), value.encode("latin1"))
+        for name, value in response.headers.items()
+        if events is None or name.lower() != "content-length"
+    ]
+    await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+    if events is None:
+        await send({"type": "http.response.body", "body": response.get_data()})
+        return
+
+    async def stream():
+        async for event in events:
+            await send({"type": "http.response.body", "body": event.encode("utf-8"), "more_body": True})
+        await send({"type": "http.response.body"})
+
+    streaming = asyncio.ensure_future(stream())
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        # The server's send() keeps returning after a disconnect, so only receive() tells
+        await asyncio.wait({streaming, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+        if not streaming.done():
+            logger.info("Client disconnected mid-stream; stopping its scrape")
+            streaming.cancel()
+        try:
+            await streaming
+        except asyncio.CancelledError:
+            if not disconnected.done():
+                raise
+    finally:
+        streaming.cancel()
+        disconnected.cancel()
+        await events.aclose()
+
+# -----------------------------
+# Native views
+# -----------------------------
+# Each runs inside the request's Flask context (pushed by handle_http) and returns
+# what a Flask view would, or an async iterator of SSE events to stream.
+async def upload_resume():
+    """Async /upload: same response as the Flask view, scraping on the event loop"""
+    upload, error_response = await asyncio.to_thread(app._begin_upload)
+    if error_response:
+        return error_response
+
+    try:
+        skills = upload["skills"]
+        wait_for_jobs = request.args.get("wait", "false").lower() == "true"
+        truncated_portals = []
+        job_id = None
+        job_opportunities = await asyncio.to_thread(app.find_indexed_jobs, skills)
+        if not job_opportunities and wait_for_jobs:
+            job_opportunities = await app.scrape_all_jobs_async(
+                skills, app._remaining_budget(upload["time_budget"], upload["started"]), truncated=truncated_portals
+            )
+        elif not job_opportunities:
+            job_id = await asyncio.to_thread(
+                app.SCRAPE_JOBS.submit,
+                skills, app._remaining_budget(upload["time_budget"], upload["started"]), loop=asyncio.get_running_loop()
+            )
+            logger.info(f"Scraping job opportunities in background job {job_id}")
+
+        return app._upload_response(upload, job_opportunities, job_id, truncated_portals)
+
+    except Exception as e:
+        return app._upload_error_response(e)
+
+async def upload_resume_stream():
+    """Async /upload/stream: the same Server-Sent Events, fed by the async scrapers"""
+    upload, error_response = await asyncio.to_thread(app._begin_upload)
+    if error_response:
+        return error_response
+
+    indexed_jobs = await asyncio.to_thread(app.find_indexed_jobs, upload["skills"])
+    return stream_events(upload, indexed_jobs)
+
+async def stream_events(upload, indexed_jobs):
+    skills = upload["skills"]
+    stream = app.UploadStream(skills, upload["role_matches"], indexed=bool(indexed_jobs))
+    truncated_portals = []
+    yield stream.skills_event()
+
+    # Each batch is deduplicated and ranked on a thread
+    if indexed_jobs:
+        yield await asyncio.to_thread(stream.jobs_event, "Job Index", indexed_jobs)
+    else:
+        # Portals report into the queue as they finish; None marks the end of the scrape
+        portal_results = asyncio.Queue()
+        scrape = asyncio.ensure_future(app.scrape_all_jobs_async(
+            skills, app._remaining_budget(upload["time_budget"], upload["started"]),
+            on_portal_done=lambda name, jobs: portal_results.put_nowait((name, jobs)),
+            truncated=truncated_portals
+        ))
+        scrape.add_done_callback(lambda _: portal_results.put_nowait(None))
+        try:
+            while True:
+                result = await portal_results.get()
+                if result is None:
+                    break
+                yield await asyncio.to_thread(stream.jobs_event, *result)
+        finally:
+            scrape.cancel()
+        if not scrape.cancelled() and scrape.exception():
+            logger.error(f"Error streaming job scrape: {scrape.exception()}")
+
+    yield stream.done_event(truncated_portals)
+
+async def analyze_skills():
+    """Async /api/analyze: jobs for include_jobs are scraped on the event loop"""
+    try:
+        analysis, error_response = await asyncio.to_thread(app._begin_analysis)
+        if error_response:
+            return error_response
+
+        job_opportunities = []
+        truncated_portals = []
+        if analysis["include_jobs"]:
+            job_opportunities = await asyncio.to_thread(app.find_indexed_jobs, analysis["skills"])
+            if not job_opportunities:
+                job_opportunities = await app.scrape_all_jobs_async(
+                    analysis["skills"], app._remaining_budget(analysis["time_budget"], analysis["started"]),
+                    truncated=truncated_portals
+                )
+
+        return app._analysis_response(analysis, job_opportunities, truncated_portals)
+
+    except Exception as e:
+        return app._analysis_error_response(e)
+
+NATIVE_VIEWS = {
+    ("POST", "/upload"): upload_resume,
+    ("POST", "/upload/stream"): upload_resume_stream,
+    ("POST", "/api/analyze"): analyze_skills,
+}
+
+# -----------------------------
+# ASGI application
+# -----------------------------
+async def run_view(view, too_large):
+    """Run a native view like Flask's dispatch would: before_request hooks, then error handlers"""
+    try:
+        rv = flask_app.preprocess_request()
+        if rv is not None:
+            return rv
+        if too_large:
+            raise RequestEntityTooLarge()
+        return await view()
+    except HTTPException as e:
+        return flask_app.handle_user_exception(e)
+    except Exception as e:
+        return flask_app.handle_exception(e)
+
+async def handle_http(scope, receive, send):
+    body, too_large = await read_body(receive, flask_app.config.get("MAX_CONTENT_LENGTH"))
+    if body is None:
+        return
+    try:
+        environ = build_environ(scope, body)
+        view = NATIVE_VIEWS.get((environ["REQUEST_METHOD"], environ["PATH_INFO"]))
+        if view is None and not too_large:
+            # Everything else is plain Flask, run on a thread with the response buffered
+            response = await asyncio.to_thread(Response.from_app, flask_app, environ, buffered=True)
+            await send_response(send, response)
+            return
+
+        ctx = flask_app.request_context(environ)
+        ctx.push()
+        try:
+            rv = await run_view(view, too_large)
+            events = None
+            if hasattr(rv, "__aiter__"):
+                events, rv = rv, app._sse_response(())
+            response = flask_app.process_response(flask_app.make_response(rv))
+            await send_response(send, response, events, receive)
+        finally:
+            ctx.pop()
+    finally:
+        body.close()
+
+async def handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await app.close_async_http_client()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def application(scope, receive, send):
+    if scope["type"] == "http":
+        await handle_http(scope, receive, send)
+    elif scope["type"] == "lifespan":
+        await handle_lifespan(receive, send)
+    else:
+        raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
@@ -0,0 +1,304 @@
+"""Benchmark suite for the resume -> roles -> jobs pipeline.
+
+Times each stage offline and reports throughput, p50/p99 latency and peak
+Python memory (tracemalloc):
+
+    pdf_extract       extract_skills_from_resume on the bundled sample PDFs
+    skill_match       score_skills_in_text on synthetic resume text
+    role_match        match_job_roles on synthetic large skill sets
+    skills_report     generate_skills_report on the same skill sets
+    rank_jobs         rank_jobs over 300 synthetic job candidates per skill set
+    dedup             deduplicate_jobs over 5000 listings with reworded near-duplicates
+    scrape_*          each portal scraper replaying the pages in fixtures/http
+    scrape_all        scrape_all_jobs against the same fixtures
+    scrape_all_async  scrape_all_jobs_async (the asgi.py path) against the same fixtures
+    index_search      JobIndex.search over a synthetic 20k-listing index
+
+Caches are cleared before every operation so the real work is measured,
+and the per-host rate limiter is disabled for the scraper stages.
+
+The fixtures/http/<host>/default.html pages are hand-written stand-ins shaped
+like each portal's results page, not captures. Record real pages (saved as
+fixtures/http/<host>/<url hash>.html, which replay prefers) and re-save the
+baseline before trusting the scrape_* numbers:
+
+    FETCH_MODE=record python -c "import app; app.scrape_all_jobs(['Python', 'SQL', 'Git'])"
+
+benchmarks/baseline.json is the committed baseline; it was taken with the
+default iterations and the stand-in pages, so re-save it on the machine that
+runs --compare.
+
+Usage:
+    python benchmark.py                                # run everything
+    python benchmark.py --stages role_match,scrape_all -n 500
+    python benchmark.py --save-baseline benchmarks/baseline.json
+    python benchmark.py --compare benchmarks/baseline.json --tolerance 0.25
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+# Benchmarks never touch the shared job cache or job index files
+os.environ.setdefault("JOB_CACHE_DB", "")
+os.environ.setdefault("JOB_INDEX_DB", "")
+
+import app
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_RESUMES = [
+    os.path.join(BASE_DIR, "Sai Ganesh Resume.pdf"),
+    os.path.join(BASE_DIR, "uploads", "JV_s_Resume_Template.pdf"),
+]
+
+FIXTURES_DIR = os.path.join(BASE_DIR, "fixtures", "http")
+
+FILLER_WORDS = (
+    "worked on team project delivered features improved performance designed built "
+    "responsible for customers analysis reporting using with and the of to in for "
+    "experience university bachelor intern developed maintained collaborated"
+).split()
+
+def synthetic_resume_text(rng, skills_count=40, words=900):
+    """Resume-like text mixing real skill names with filler"""
+    tokens = [rng.choice(FILLER_WORDS) for _ in range(words)]
+    for skill in rng.sample(app.ALL_SKILLS, skills_count):
+        tokens.insert(rng.randrange(len(tokens)), skill)
+    return " ".join(tokens).lower()
+
+def synthetic_skill_sets(rng, count=200):
+    return [rng.sample(app.ALL_SKILLS, rng.randint(20, 60)) for _ in range(count)]
+
+def synthetic_jobs(rng, count):
+    """Job listings whose titles mention a few random skills"""
+    return [
+        {"title": f"{' '.join(rng.sample(app.ALL_SKILLS, 2))} Developer", "company": f"Company {i}"}
+        for i in range(count)
+    ]
+
+def synthetic_listings_with_duplicates(rng, count):
+    """Job listings where about a third repeat an earlier one with a reworded title"""
+    rewordings = [("Senior", "Sr."), ("Engineer", "Engg."), ("Developer", "Developer - Remote")]
+    listings = []
+    for i in range(count):
+        if listings and rng.random() < 0.33:
+            job = dict(rng.choice(listings))
+            old, new = rng.choice(rewordings)
+            job["title"] = job["title"].replace(old, new)
+            job["company"] += " Pvt Ltd"
+        else:
+            skill = rng.choice(app.ALL_SKILLS)
+            level = rng.choice(["", "Senior ", "Junior "])
+            role = rng.choice(["Developer", "Engineer", "Analyst"])
+            job = {"title": f"{level}{skill} {role}", "company": f"Company {rng.randrange(count // 4)}"}
+        listings.append(job)
+    return listings
+
+def synthetic_job_index(rng, path, jobs=20000):
+    """Fill a JobIndex with jobs whose titles and descriptions mention random skills"""
+    index = app.JobIndex(path)
+    batch = []
+    for i in range(jobs):
+        skills = rng.sample(app.ALL_SKILLS, rng.randint(3, 8))
+        batch.append({
+            "title": f"{skills[0]} Developer {i}",
+            "company": f"Company {i % 500}",
+            "desc": ", ".join(skills[1:]),
+            "source": "Synthetic"
+        })
+        if len(batch) == 1000:
+            index.add_jobs(batch)
+            batch = []
+    index.add_jobs(batch)
+    return index
+
+def build_stages(rng, workdir):
+    """Return {stage name: callable performing one operation}"""
+    resumes = []
+    for path in SAMPLE_RESUMES:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                resumes.append(f.read())
+    texts = [synthetic_resume_text(rng) for _ in range(50)]
+    skill_sets = synthetic_skill_sets(rng)
+    role_matches = [app.match_job_roles(skills) for skills in skill_sets]
+    candidates = synthetic_jobs(rng, 300)
+    listings = synthetic_listings_with_duplicates(rng, 5000)
+
+    def cycle(items):
+        state = {"i": 0}
+        def next_item():
+            item = items[state["i"] % len(items)]
+            state["i"] += 1
+            return item
+        return next_item
+
+    next_resume = cycle(resumes)
+    next_text = cycle(texts)
+    next_index = cycle(list(range(len(skill_sets))))
+    scrape_skills = ["Python", "SQL", "Git"]
+
+    def pdf_extract():
+        app.RESUME_CACHE.clear()
+        app.extract_skills_from_resume(next_resume())
+
+    def skill_match():
+        app.score_skills_in_text(next_text())
+
+    def role_match():
+        app.match_job_roles(skill_sets[next_index()])
+
+    def skills_report():
+        i = next_index()
+        app.generate_skills_report(skill_sets[i], role_matches[i])
+
+    def rank_jobs():
+        app.rank_jobs(candidates, skill_sets[next_index()], 15)
+
+    def dedup():
+        app.deduplicate_jobs(listings)
+
+    def scraper(scrape_func):
+        def run():
+            app.JOB_CACHE.clear()
+            scrape_func(scrape_skills, 6)
+        return run
+
+    def scrape_all():
+        app.JOB_CACHE.clear()
+        app.scrape_all_jobs(scrape_skills)
+
+    def scrape_all_async():
+        app.JOB_CACHE.clear()
+        app.run_async(app.scrape_all_jobs_async(scrape_skills))
+
+    job_index = synthetic_job_index(rng, os.path.join(workdir, "job_index.sqlite3"))
+
+    def index_search():
+        job_index.search(skill_sets[next_index()], 15)
+
+    stages = {
+        "skill_match": skill_match,
+        "role_match": role_match,
+        "skills_report": skills_report,
+        "rank_jobs": rank_jobs,
+        "dedup": dedup,
+        "scrape_internshala": scraper(app.scrape_internshala_jobs),
+        "scrape_naukri": scraper(app.scrape_naukri_jobs),
+        "scrape_indeed": scraper(app.scrape_indeed_jobs),
+        "scrape_all": scrape_all,
+        "scrape_all_async": scrape_all_async,
+        "index_search": index_search,
+    }
+    if resumes:
+        stages = {"pdf_extract": pdf_extract, **stages}
+    return stages
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run_stage(operation, iterations, warmup):
+    for _ in range(warmup):
+        operation()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        op_started = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - op_started)
+    elapsed = time.perf_counter() - started
+
+    # Memory is measured in a separate, shorter pass so tracing doesn't skew timings
+    tracemalloc.start()
+    for _ in range(min(iterations, 5)):
+        operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "throughput_per_s": round(iterations / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def compare(results, baseline, tolerance):
+    """Print the change against a baseline and return the stages that regressed"""
+    regressions = []
+    print(f"\n{'stage':<20}{'p50 base':>12}{'p50 now':>12}{'change':>10}{'p99 base':>12}{'p99 now':>12}{'change':>10}")
+    for stage, result in results.items():
+        base = baseline.get(stage)
+        if not base:
+            print(f"{stage:<20}{'(new stage)':>12}")
+            continue
+        row = f"{stage:<20}"
+        regressed = False
+        for metric in ("p50_ms", "p99_ms"):
+            change = (result[metric] - base[metric]) / base[metric] if base[metric] else 0.0
+            regressed = regressed or change > tolerance
+            row += f"{base[metric]:>12.3f}{result[metric]:>12.3f}{change:>+10.1%}"
+        print(row + ("  REGRESSED" if regressed else ""))
+        if regressed:
+            regressions.append(stage)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction, matching and scraping stages")
+    parser.add_argument("--stages", help="Comma-separated stages to run (default: all)")
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="Timed operations per stage")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed operations per stage")
+    parser.add_argument("--scrape-iterations", type=int, default=20, help="Timed operations for scrape_* stages")
+    parser.add_argument("--seed", type=int, default=15, help="Seed for synthetic inputs")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--save-baseline", help="Write results as the baseline to compare future runs against")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50/p99 slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    app.logger.setLevel("WARNING")
+    app.HOST_RATE_LIMITER = app.HostRateLimiter(0, 0, 0, 0)
+    app.set_fetch_backend(app.ReplayFetcher(FIXTURES_DIR))
+
+    # Removed when the process exits
+    workdir = tempfile.TemporaryDirectory(prefix="benchmark-")
+    stages = build_stages(random.Random(args.seed), workdir.name)
+    selected = args.stages.split(",") if args.stages else list(stages)
+    unknown = [name for name in selected if name not in stages]
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(unknown)} (available: {', '.join(stages)})")
+
+    results = {}
+    print(f"{'stage':<20}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KB':>10}")
+    for name in selected:
+        iterations = args.scrape_iterations if name.startswith("scrape_") else args.iterations
+        result = run_stage(stages[name], iterations, args.warmup)
+        results[name] = result
+        print(f"{name:<20}{result['throughput_per_s']:>10}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}{result['peak_kb']:>10.1f}")
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
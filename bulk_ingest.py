@@ -0,0 +1,180 @@
+"""Bulk resume ingestion: extract skills and match roles for a folder of PDFs.
+
+Runs extract_skills_from_resume and match_job_roles from app.py across a
+process pool without going through /upload, so no job portals are scraped.
+Results are appended to a JSONL file as they finish; re-running the same
+command skips resumes already present in the output, so an interrupted
+backfill picks up where it stopped.
+
+Usage:
+    python bulk_ingest.py archive/ "more/**/*.pdf" -o results.jsonl --workers 8
+    python bulk_ingest.py archive/ -o results.parquet   # needs pyarrow
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import logging
+from multiprocessing import Pool
+
+# Backfills never scrape, so don't create the shared job cache or job index files
+os.environ.setdefault("JOB_CACHE_DB", "")
+os.environ.setdefault("JOB_INDEX_DB", "")
+# Each pool worker already is a process; don't fan pages out to a second pool
+os.environ.setdefault("PDF_EXTRACT_PROCESSES", "0")
+
+import app
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+logger = logging.getLogger("bulk_ingest")
+
+def find_resumes(inputs):
+    """Expand directories (recursively), glob patterns and file paths into sorted PDF paths"""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True)
+            matches += glob.glob(os.path.join(item, "**", "*.PDF"), recursive=True)
+        elif os.path.isfile(item):
+            matches = [item]
+        else:
+            matches = glob.glob(item, recursive=True)
+        paths.update(os.path.abspath(path) for path in matches if path.lower().endswith(".pdf"))
+    return sorted(paths)
+
+def load_checkpoint(checkpoint_path):
+    """Return the resume paths already recorded in a JSONL checkpoint"""
+    done = set()
+    if not os.path.exists(checkpoint_path):
+        return done
+
+    with open(checkpoint_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                # A partially written last line from an interrupted run
+                continue
+    return done
+
+def truncate_partial_line(checkpoint_path):
+    """Cut an interrupted run's half-written last line so appended records start on a fresh line"""
+    if not os.path.exists(checkpoint_path):
+        return
+    with open(checkpoint_path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position != end:
+            logger.warning(f"Dropping a partially written record at the end of {checkpoint_path}")
+            f.truncate(position)
+
+def _init_worker():
+    # Keep per-resume INFO logs from drowning the progress output
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+def process_resume(path):
+    """Extract skills and role matches for one resume; runs in a pool worker"""
+    started = time.monotonic()
+    result = {"path": path}
+    try:
+        skills = app.extract_skills_from_resume(path)
+        result["skills"] = skills
+        result["skills_count"] = len(skills)
+        result["role_matches"] = app.match_job_roles(skills)
+        if not skills:
+            result["error"] = "No technical skills found"
+    except Exception as e:
+        result["skills"] = []
+        result["skills_count"] = 0
+        result["role_matches"] = []
+        result["error"] = str(e)
+    result["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+    return result
+
+def write_parquet(checkpoint_path, output_path):
+    """Convert the JSONL checkpoint into a Parquet file"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+
+    rows = []
+    skipped = 0
+    with open(checkpoint_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            # Nested role matches are kept as a JSON string column
+            row["role_matches"] = json.dumps(row.get("role_matches", []))
+            row.setdefault("error", None)
+            rows.append(row)
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} unreadable lines in {checkpoint_path}")
+    pq.write_table(pa.Table.from_pylist(rows), output_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract skills and role matches from many resume PDFs")
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns or PDF files")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.jsonl or .parquet)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--chunksize", type=int, default=16, help="Resumes handed to a worker at a time")
+    args = parser.parse_args(argv)
+
+    as_parquet = args.output.lower().endswith(".parquet")
+    # Parquet can't be appended to, so progress is checkpointed as JSONL next to it
+    checkpoint_path = args.output + ".partial.jsonl" if as_parquet else args.output
+
+    paths = find_resumes(args.inputs)
+    truncate_partial_line(checkpoint_path)
+    done = load_checkpoint(checkpoint_path)
+    todo = [path for path in paths if path not in done]
+    logger.info(f"Found {len(paths)} resumes, {len(done)} already processed, {len(todo)} to go")
+
+    started = time.monotonic()
+    failures = 0
+    with open(checkpoint_path, "a", encoding="utf-8") as out, \
+         Pool(processes=args.workers, initializer=_init_worker) as pool:
+        results = pool.imap_unordered(process_resume, todo, chunksize=args.chunksize)
+        progress = tqdm(results, total=len(todo), unit="resume") if tqdm else results
+
+        for count, result in enumerate(progress, 1):
+            out.write(json.dumps(result) + "\n")
+            # A killed run then loses at most the record being written
+            out.flush()
+            if "error" in result:
+                failures += 1
+            if count % 100 == 0:
+                if not tqdm:
+                    rate = count / (time.monotonic() - started)
+                    logger.info(f"Processed {count}/{len(todo)} resumes ({rate:.1f}/s)")
+
+    if as_parquet:
+        write_parquet(checkpoint_path, args.output)
+        os.remove(checkpoint_path)
+
+    logger.info(f"Done: {len(todo)} resumes in {time.monotonic() - started:.1f}s, {failures} without skills or failed")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
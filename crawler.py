@@ -0,0 +1,167 @@
+"""Background crawler that keeps the local job index fresh for every skill.
+
+Runs the portal scrapers from app.py for each skill in ALL_SKILLS (least
+recently crawled first) and stores the listings in the SQLite job index that
+/upload, /upload/stream and /api/analyze search before scraping live. It fills
+the same job cache as live scraping but has its own per-host rate limits
+(CRAWL_HOST_RATE) and circuit breakers, so it never spends user requests' rate
+budget or opens the breakers they depend on.
+
+Run it as its own process only where it shares a disk with the web workers.
+On Heroku every dyno has its own ephemeral filesystem, so a crawler dyno's
+index is never seen by the web dyno; there, set CRAWL_IN_WEB=true and
+gunicorn.conf.py starts the crawl loop on a thread of one web worker per dyno.
+That index starts empty after every dyno restart and is rebuilt by the crawl.
+
+Usage:
+    python crawler.py                      # crawl forever, a full pass every --interval seconds
+    python crawler.py --once               # one pass over all skills, then exit
+    python crawler.py --skills Python,SQL --once
+    python crawler.py --seed jobs.json     # also load a catalogue of {"title", "desc"} entries
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import app
+
+logger = logging.getLogger("crawler")
+
+def load_catalogue(path):
+    """Read a jobs.json style catalogue into job dicts the index accepts"""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    return [
+        {
+            "title": entry["title"],
+            "company": entry.get("company") or "Job Catalogue",
+            "link": entry.get("link"),
+            "source": entry.get("source") or "Catalogue",
+            "desc": entry.get("desc", "")
+        }
+        for entry in entries
+        if entry.get("title")
+    ]
+
+def crawl_limits():
+    """A rate limiter and circuit breakers for the crawler alone"""
+    limiter = app.HostRateLimiter(app.CRAWL_HOST_RATE, app.HOST_RATE_MIN, app.CRAWL_HOST_RATE, 1)
+    breakers = {
+        host: app.CircuitBreaker(f"{portal} (crawler)", app.CIRCUIT_FAILURE_THRESHOLD, app.CIRCUIT_RESET_SECONDS)
+        for portal, host in app.PORTAL_HOSTS.items()
+    }
+    return limiter, breakers
+
+def crawl_pass(index, skills, deadline_seconds, limits=None):
+    """Scrape every skill once, least recently crawled first; returns jobs stored"""
+    limiter, breakers = limits or crawl_limits()
+    stored = 0
+    started = time.monotonic()
+    ordered = index.crawl_order(skills)
+    for count, skill in enumerate(ordered, 1):
+        try:
+            with app.scrape_limits(limiter, breakers):
+                jobs = app.scrape_all_jobs([skill], deadline_seconds)
+        except Exception as e:
+            logger.error(f"Crawling '{skill}' failed: {e}")
+            continue
+        index.add_jobs(jobs, skill=skill)
+        index.record_crawl(skill, len(jobs))
+        stored += len(jobs)
+        if count % 25 == 0:
+            logger.info(f"Crawled {count}/{len(ordered)} skills, {stored} listings stored")
+
+    removed = index.purge()
+    logger.info(f"Pass done: {len(ordered)} skills, {stored} listings stored, {removed} expired removed "
+                f"in {time.monotonic() - started:.0f}s")
+    return stored
+
+def crawl_forever(index, skills, interval, deadline_seconds, once=False):
+    """Run crawl passes, each starting interval seconds after the previous one began"""
+    limits = crawl_limits()
+    while True:
+        started = time.monotonic()
+        crawl_pass(index, skills, deadline_seconds, limits)
+        if once:
+            return
+        pause = interval - (time.monotonic() - started)
+        if pause > 0:
+            logger.info(f"Next pass in {pause:.0f}s")
+            time.sleep(pause)
+
+def _claim_crawl_lock(path):
+    """Take an exclusive lock next to the index so one process per machine crawls; the file or None"""
+    lock_file = open(f"{path}.crawler.lock", "a")
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+def all_skills():
+    # ALL_SKILLS repeats skills listed in two categories (e.g. Java, Swift)
+    return list(dict.fromkeys(app.ALL_SKILLS))
+
+def start_in_background(index, interval=6 * 3600, deadline_seconds=None):
+    """Crawl all known skills on a daemon thread; the thread, or None if another process already crawls"""
+    # The lock keeps gunicorn's other workers from each running a crawler
+    lock_file = _claim_crawl_lock(index.path)
+    if lock_file is None:
+        logger.info("Another process is already crawling into this job index")
+        return None
+
+    deadline_seconds = app.SCRAPE_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+
+    def run():
+        try:
+            crawl_forever(index, all_skills(), interval, deadline_seconds)
+        except Exception as e:
+            logger.error(f"Background crawler stopped: {e}")
+        finally:
+            lock_file.close()
+
+    thread = threading.Thread(target=run, name="job-crawler", daemon=True)
+    thread.start()
+    logger.info(f"Background crawler started in process {os.getpid()}")
+    return thread
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl job portals into the local job index")
+    parser.add_argument("--db", default=app.JOB_INDEX_DB, help="Job index SQLite file (default: JOB_INDEX_DB)")
+    parser.add_argument("--skills", help="Comma-separated skills to crawl (default: all known skills)")
+    parser.add_argument("--seed", help="jobs.json style catalogue to load before crawling")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--interval", type=float, default=6 * 3600, help="Seconds between the starts of passes")
+    parser.add_argument("--deadline", type=float, default=app.SCRAPE_DEADLINE_SECONDS, help="Scrape budget per skill")
+    args = parser.parse_args(argv)
+
+    if not args.db:
+        parser.error("No job index configured; pass --db or set JOB_INDEX_DB")
+    index = app.JobIndex(args.db)
+
+    if args.seed:
+        catalogue = load_catalogue(args.seed)
+        index.add_jobs(catalogue)
+        logger.info(f"Loaded {len(catalogue)} catalogue jobs from {args.seed}")
+
+    skills = app.canonicalize_skills(args.skills.split(",")) if args.skills else all_skills()
+    if not skills:
+        parser.error("No known skills given")
+
+    crawl_forever(index, skills, args.interval, args.deadline, once=args.once)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
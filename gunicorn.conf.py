@@ -0,0 +1,18 @@
+"""gunicorn settings for the Procfile's web process (read automatically from the working directory)"""
+import logging
+
+# Event-loop workers for asgi:application; streams and scrapes don't hold a worker each
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 60
+
+def post_fork(server, worker):
+    # Starts the crawler at worker startup rather than from a request, in the same
+    # app module the worker serves; crawler.py's lock lets one worker per machine crawl
+    import app
+    if not app.CRAWL_IN_WEB:
+        return
+    if app.JOB_INDEX is None:
+        logging.getLogger("crawler").warning("CRAWL_IN_WEB is set but no job index is configured")
+        return
+    import crawler
+    crawler.start_in_background(app.JOB_INDEX, app.CRAWL_INTERVAL_SECONDS)
@@ -0,0 +1,20 @@
+"""Per-page PDF text extraction run in the processes app.py starts for each upload.
+
+Kept apart from app.py so the worker processes (started through a forkserver,
+not forked from a web worker with live threads) only import PyPDF2 and start
+in milliseconds.
+"""
+import io
+
+from PyPDF2 import PdfReader
+
+_reader = None
+
+def load_pdf(pdf_bytes):
+    """Pool initializer: receive and parse the upload once per process"""
+    global _reader
+    _reader = PdfReader(io.BytesIO(pdf_bytes))
+
+def extract_page_text(page_num):
+    """Extract the text of one page of the loaded PDF"""
+    return _reader.pages[page_num].extract_text() or ""
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Tests never touch the shared job cache or job index files, and never the network
+os.environ.setdefault("JOB_CACHE_DB", "")
+os.environ.setdefault("JOB_INDEX_DB", "")
+os.environ.setdefault("FETCH_MODE", "replay")
+os.environ.setdefault("PDF_EXTRACT_PROCESSES", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,88 @@
+import os
+import time
+import asyncio
+import json
+
+import pytest
+
+import app
+import asgi
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(REPO_DIR, "fixtures", "http")
+RESUME = os.path.join(REPO_DIR, "Sai Ganesh Resume.pdf")
+
+def _multipart(field, filename, content):
+    boundary = "resume-boundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+def _scope(path, query, content_type, content_length=None):
+    headers = [(b"content-type", content_type.encode())]
+    if content_length is None:
+        headers.append((b"transfer-encoding", b"chunked"))
+    else:
+        headers.append((b"content-length", str(content_length).encode()))
+    return {
+        "type": "http", "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": path, "root_path": "", "query_string": query, "headers": headers,
+        "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+    }
+
+@pytest.fixture
+def resume_upload():
+    with open(RESUME, "rb") as f:
+        return _multipart("resume", "resume.pdf", f.read())
+
+@pytest.fixture(autouse=True)
+def empty_job_cache():
+    app.JOB_CACHE.clear()
+    yield
+    app.JOB_CACHE.clear()
+
+def test_chunked_upload_without_content_length(resume_upload):
+    body, content_type = resume_upload
+    chunks = [body[:1000], body[1000:]]
+    sent = []
+
+    async def receive():
+        if chunks:
+            chunk = chunks.pop(0)
+            return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.application(_scope("/upload", b"wait=true", content_type), receive, send))
+    assert sent[0]["status"] == 200
+    data = json.loads(b"".join(message.get("body", b"") for message in sent[1:]))
+    assert data["skills_count"] > 0
+
+def test_stream_stops_when_client_disconnects(resume_upload, monkeypatch):
+    monkeypatch.setattr(app, "FETCH_BACKEND", app.FaultInjectingFetcher(app.ReplayFetcher(FIXTURES_DIR), latency=(5, 5)))
+    body, content_type = resume_upload
+    events = []
+    delivered = [False]
+
+    async def receive():
+        if not delivered[0]:
+            delivered[0] = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Hang up once the skills event has been sent
+        while not events:
+            await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message.get("body"):
+            events.append(message["body"])
+
+    started = time.monotonic()
+    asyncio.run(asgi.application(_scope("/upload/stream", b"", content_type, len(body)), receive, send))
+    assert time.monotonic() - started < 3
+    assert len(events) == 1 and events[0].startswith(b"event: skills")
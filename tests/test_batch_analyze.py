@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import app
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+def post_batch(client, body):
+    response = client.post("/api/analyze/batch", data=json.dumps(body), content_type="application/json")
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return response, lines
+
+def test_one_result_line_per_candidate_in_order(client):
+    response, lines = post_batch(client, {"candidates": [
+        {"id": "a", "skills": ["python", "SQL"]},
+        {"id": "b", "skills": "Python"},
+        {"skills": ["not a skill"]},
+        "not a candidate",
+        {"id": "e", "skills": ["SQL", "Python"]},
+    ]})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert [(line["index"], line["id"], line["success"]) for line in lines] == [
+        (0, "a", True), (1, "b", False), (2, 2, False), (3, 3, False), (4, "e", True)
+    ]
+    assert lines[0]["skills"] == ["Python", "SQL"]
+    assert lines[0]["role_matches"] == app.match_job_roles(["Python", "SQL"])
+    assert "skills_analysis" in lines[0]
+    assert lines[1]["error"] == "Skills must be a non-empty list"
+    assert lines[2]["error"] == "No valid skills provided"
+    assert lines[3]["error"] == "Skills must be a non-empty list"
+
+def test_include_report_false_omits_the_report(client):
+    _, lines = post_batch(client, {"include_report": False, "candidates": [{"skills": ["Python"]}]})
+    assert lines[0]["success"] and "skills_analysis" not in lines[0]
+
+@pytest.mark.parametrize("body", [
+    ["Python"],
+    "candidates",
+    {},
+    {"candidates": "Python"},
+    {"candidates": []},
+    {"candidates": [{"skills": ["Python"]}], "include_report": "false"},
+    {"candidates": [{"skills": ["Python"]}], "include_report": 0},
+])
+def test_malformed_body_is_rejected(client, body):
+    response, _ = post_batch(client, body)
+    assert response.status_code == 400
+
+def test_too_many_candidates(client, monkeypatch):
+    monkeypatch.setattr(app, "BATCH_MAX_CANDIDATES", 2)
+    response, _ = post_batch(client, {"candidates": [{"skills": ["Python"]}] * 3})
+    assert response.status_code == 413
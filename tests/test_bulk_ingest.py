@@ -0,0 +1,43 @@
+import os
+import json
+import shutil
+
+import bulk_ingest
+
+RESUME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Sai Ganesh Resume.pdf")
+
+def _copy_resumes(folder, names):
+    for name in names:
+        shutil.copy(RESUME, folder / name)
+
+def _records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_resume_after_run_killed_mid_write(tmp_path):
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    _copy_resumes(resumes, ["a.pdf", "b.pdf", "zz.pdf"])
+    output = tmp_path / "results.jsonl"
+    assert bulk_ingest.main([str(resumes), "-o", str(output), "--workers", "1"]) == 0
+
+    # A run killed while writing its last record leaves half a line behind
+    content = output.read_bytes()
+    output.write_bytes(content[:len(content) - 20])
+    _copy_resumes(resumes, ["c.pdf"])
+    assert bulk_ingest.main([str(resumes), "-o", str(output), "--workers", "1"]) == 0
+
+    records = _records(output)
+    paths = [record["path"] for record in records]
+    assert sorted(paths) == sorted(str(resumes / name) for name in ["a.pdf", "b.pdf", "c.pdf", "zz.pdf"])
+    assert all(record["skills_count"] > 0 for record in records)
+
+def test_truncate_partial_line(tmp_path):
+    checkpoint = tmp_path / "results.jsonl"
+    checkpoint.write_text('{"path": "a"}\n{"path": "b", "skil')
+    bulk_ingest.truncate_partial_line(str(checkpoint))
+    assert checkpoint.read_text() == '{"path": "a"}\n'
+
+    checkpoint.write_text('{"path": "b", "skil')
+    bulk_ingest.truncate_partial_line(str(checkpoint))
+    assert checkpoint.read_text() == ""
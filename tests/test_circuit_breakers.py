@@ -0,0 +1,125 @@
+import os
+import time
+import asyncio
+
+import pytest
+
+import app
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "http")
+
+@pytest.fixture
+def slow_portals(monkeypatch):
+    """Healthy replayed portals that take 0.5s per page, with fresh breakers and limiter"""
+    monkeypatch.setattr(app, "FETCH_BACKEND", app.FaultInjectingFetcher(app.ReplayFetcher(FIXTURES_DIR), latency=(0.5, 0.5)))
+    monkeypatch.setattr(app, "HOST_RATE_LIMITER", app.HostRateLimiter(1.0, 0.1, 4.0, 2))
+    monkeypatch.setattr(app, "PORTAL_BREAKERS", {
+        host: app.CircuitBreaker(portal, 3, 60) for portal, host in app.PORTAL_HOSTS.items()
+    })
+    app.JOB_CACHE.clear()
+    yield
+    app.JOB_CACHE.clear()
+
+def test_short_budget_leaves_breakers_closed(slow_portals):
+    for _ in range(2):
+        truncated = []
+        app.scrape_all_jobs(["Python", "SQL"], 0.3, truncated=truncated)
+        assert sorted(truncated) == sorted(app.PORTAL_HOSTS)
+
+    for breaker in app.PORTAL_BREAKERS.values():
+        assert breaker.stats()["state"] == "closed"
+        assert breaker.stats()["consecutive_failures"] == 0
+
+def test_short_budget_async_leaves_breakers_closed(slow_portals):
+    truncated = []
+    asyncio.run(app.scrape_all_jobs_async(["Python", "SQL"], 0.3, truncated=truncated))
+    assert sorted(truncated) == sorted(app.PORTAL_HOSTS)
+    for breaker in app.PORTAL_BREAKERS.values():
+        assert breaker.stats()["state"] == "closed"
+        assert breaker.stats()["consecutive_failures"] == 0
+
+def test_long_host_queue_is_not_a_portal_failure(slow_portals, monkeypatch):
+    monkeypatch.setattr(app, "HOST_MAX_WAIT_SECONDS", 0.5)
+    url = "https://www.naukri.com/python-jobs"
+    breaker = app.PORTAL_BREAKERS["www.naukri.com"]
+    for _ in range(breaker.failure_threshold + 1):
+        app.HOST_RATE_LIMITER.throttled(url, 60)
+        assert app.safe_request(url) is None
+        assert asyncio.run(app.safe_request_async(url)) is None
+
+    assert breaker.stats()["state"] == "closed"
+    assert breaker.stats()["consecutive_failures"] == 0
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock the test moves by hand"""
+    now = [1000.0]
+    monkeypatch.setattr(app.time, "monotonic", lambda: now[0])
+    return now
+
+def test_opens_after_threshold_failures_in_a_row(clock):
+    breaker = app.CircuitBreaker("Naukri", 3, 60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.stats()["state"] == "closed"
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.stats() == {"state": "open", "consecutive_failures": 3, "retry_in_s": 60.0, "trips": 1}
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = app.CircuitBreaker("Naukri", 1, 60)
+    breaker.record_failure()
+    clock[0] += 59
+    assert not breaker.allow()
+
+    clock[0] += 1
+    assert not breaker.is_open()
+    assert breaker.allow()
+    assert breaker.stats()["state"] == "half_open"
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+    # A probe that never reached the portal frees the slot for the next caller
+    breaker.release()
+    assert breaker.allow()
+
+def test_probe_success_closes_and_failure_reopens(clock):
+    breaker = app.CircuitBreaker("Naukri", 2, 60)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.stats() == {"state": "open", "consecutive_failures": 3, "retry_in_s": 60.0, "trips": 2}
+
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.stats() == {"state": "closed", "consecutive_failures": 0, "retry_in_s": 0.0, "trips": 2}
+    assert breaker.allow() and breaker.allow()
+
+def test_failing_portal_is_skipped_until_probe_succeeds(monkeypatch):
+    url = "https://www.naukri.com/python-jobs"
+    breaker = app.CircuitBreaker("Naukri", 2, 0.2)
+    monkeypatch.setattr(app, "HOST_RATE_LIMITER", app.HostRateLimiter(0, 0, 0, 0))
+    monkeypatch.setattr(app, "PORTAL_BREAKERS", {"www.naukri.com": breaker})
+    monkeypatch.setattr(app, "FETCH_BACKEND", app.FaultInjectingFetcher(app.ReplayFetcher(FIXTURES_DIR), timeout_rate=1))
+
+    assert app.safe_request(url, max_retries=1) is None
+    assert app.safe_request(url, max_retries=1) is None
+    assert breaker.stats()["state"] == "open"
+
+    healthy = app.ReplayFetcher(FIXTURES_DIR)
+    monkeypatch.setattr(app, "FETCH_BACKEND", healthy)
+    assert app.safe_request(url, max_retries=1) is None
+    assert breaker.stats()["state"] == "open"
+
+    time.sleep(0.25)
+    assert app.safe_request(url, max_retries=1).status_code == 200
+    assert breaker.stats()["state"] == "closed"
@@ -0,0 +1,28 @@
+import os
+
+import app
+import crawler
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "http")
+
+def test_crawler_uses_its_own_limits(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "FETCH_BACKEND", app.FaultInjectingFetcher(app.ReplayFetcher(FIXTURES_DIR), timeout_rate=1.0))
+    monkeypatch.setattr(app, "HOST_RATE_LIMITER", app.HostRateLimiter(1.0, 0.1, 4.0, 2))
+    monkeypatch.setattr(app, "PORTAL_BREAKERS", {
+        host: app.CircuitBreaker(portal, 3, 60) for portal, host in app.PORTAL_HOSTS.items()
+    })
+    # An unlimited limiter keeps the test fast; the crawler's breakers are the real ones
+    limiter, breakers = app.HostRateLimiter(0, 0, 0, 0), crawler.crawl_limits()[1]
+    app.JOB_CACHE.clear()
+
+    index = app.JobIndex(str(tmp_path / "index.sqlite3"))
+    crawler.crawl_pass(index, ["Python", "SQL"], 5, (limiter, breakers))
+
+    assert all(breaker.stats()["consecutive_failures"] > 0 for breaker in breakers.values())
+    for breaker in app.PORTAL_BREAKERS.values():
+        assert breaker.stats()["consecutive_failures"] == 0
+    assert app.HOST_RATE_LIMITER.stats() == {}
+
+def test_all_skills_has_no_repeats():
+    skills = crawler.all_skills()
+    assert len(skills) == len(set(skills)) == len(set(app.ALL_SKILLS))
@@ -0,0 +1,22 @@
+import pytest
+
+import app
+
+def _job(title, company="Acme Pvt Ltd"):
+    return {"title": title, "company": company, "link": None}
+
+@pytest.mark.parametrize("first, second", [
+    ("SQL Developer", "MySQL Developer"),
+    ("Software Engineer", "Software Engineer (Python)"),
+    ("Junior Python Developer", "Senior Python Developer"),
+])
+def test_different_jobs_are_kept(first, second):
+    assert len(app.deduplicate_jobs([_job(first), _job(second)])) == 2
+
+@pytest.mark.parametrize("first, second", [
+    ("Sr. Python Dev", "Senior Python Developer"),
+    ("Python Developer", "Python Developer - Remote"),
+    ("Machine Learning Engineer", "Machine Learning Engineers"),
+])
+def test_reworded_duplicates_are_merged(first, second):
+    assert len(app.deduplicate_jobs([_job(first), _job(second, "Acme Limited")])) == 1
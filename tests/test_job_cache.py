@@ -0,0 +1,84 @@
+import pytest
+
+import app
+
+@pytest.fixture(autouse=True)
+def empty_job_cache():
+    app.JOB_CACHE.clear()
+    yield
+    app.JOB_CACHE.clear()
+
+def test_small_limit_does_not_shrink_later_results():
+    full = app.scrape_naukri_jobs(["Python"], limit=6)
+    app.JOB_CACHE.clear()
+
+    assert len(app.scrape_naukri_jobs(["Python"], limit=2)) == 2
+    assert app.scrape_naukri_jobs(["Python"], limit=6) == full
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A wall clock the test moves by hand"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(app.time, "time", lambda: now[0])
+    return now
+
+JOBS = [{"title": "Python Developer", "company": "Acme", "link": "https://example.com/1"}]
+
+def test_entries_go_stale_then_expire(clock):
+    cache = app.JobCache(ttl=60, stale_ttl=120, max_entries=8)
+    cache.set("Naukri", "Python  Developer", JOBS)
+
+    clock[0] += 60
+    assert cache.get("Naukri", "python developer") == (JOBS, True)
+    clock[0] += 1
+    assert cache.get("Naukri", "python developer") == (JOBS, False)
+    clock[0] += 120
+    assert cache.get("Naukri", "python developer") is None
+    assert cache.stats()["entries"] == 0
+    assert (cache.hits, cache.stale_hits, cache.misses) == (1, 1, 1)
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = app.JobCache(ttl=60, stale_ttl=0, max_entries=2)
+    cache.set("Naukri", "a", JOBS)
+    cache.set("Naukri", "b", JOBS)
+    assert cache.get("Naukri", "a") is not None
+    cache.set("Naukri", "c", JOBS)
+
+    assert cache.get("Naukri", "b") is None
+    assert cache.get("Naukri", "a") is not None
+    assert cache.get("Naukri", "c") is not None
+
+def test_shared_store_serves_other_workers(clock, tmp_path):
+    store = app.SharedJobStore(str(tmp_path / "jobs.sqlite3"))
+    app.JobCache(ttl=60, stale_ttl=60, max_entries=8, store=store).set("Naukri", "python", JOBS)
+
+    other_worker = app.JobCache(ttl=60, stale_ttl=60, max_entries=8, store=store)
+    assert other_worker.get("Naukri", "python") == (JOBS, True)
+    assert other_worker.store_hits == 1
+
+def test_stale_entry_is_served_and_refreshed_once(clock, monkeypatch):
+    monkeypatch.setattr(app, "JOB_CACHE", app.JobCache(ttl=60, stale_ttl=600, max_entries=8))
+    app.JOB_CACHE.set("Naukri", "python", JOBS)
+    clock[0] += 120
+
+    refreshed = app.threading.Event()
+    release = app.threading.Event()
+    calls = []
+
+    def slow_scrape(portal, query, deadline=None):
+        calls.append((portal, query))
+        release.wait(5)
+        fresh = [dict(JOBS[0], title="Senior Python Developer")]
+        app.JOB_CACHE.set(portal, query, fresh)
+        refreshed.set()
+        return fresh
+
+    monkeypatch.setattr(app, "_scrape_and_cache", slow_scrape)
+    # Served straight from the stale entry while one refresh runs behind it
+    assert app._scrape_queries("Naukri", ["python"], 6) == JOBS
+    assert app._scrape_queries("Naukri", ["python"], 6) == JOBS
+    release.set()
+    assert refreshed.wait(5)
+
+    assert calls == [("Naukri", "python")]
+    assert app.JOB_CACHE.get("Naukri", "python") == ([dict(JOBS[0], title="Senior Python Developer")], True)
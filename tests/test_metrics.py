@@ -0,0 +1,71 @@
+import re
+
+import pytest
+
+import app
+
+SAMPLE = re.compile(r'^([a-z_]+)(\{[^}]*\})? (\S+)$')
+
+def parse_metrics(text):
+    """{name: type} and [(name, labels, value)] from Prometheus text output"""
+    types = {}
+    samples = []
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, metric_type = line.split(" ")
+            types[name] = metric_type
+        elif line and not line.startswith("#"):
+            match = SAMPLE.match(line)
+            assert match, line
+            name, labels, value = match.groups()
+            samples.append((name, dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', labels or "")), float(value)))
+    return types, samples
+
+def test_histogram_buckets_are_cumulative():
+    histogram = app.LatencyHistogram("test_seconds", "Test", "stage", buckets=(0.1, 1))
+    for seconds in (0.05, 0.1, 0.5, 3):
+        histogram.observe('say "hi"', seconds)
+
+    assert histogram.render() == [
+        "# HELP test_seconds Test",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{stage="say \\"hi\\"",le="0.1"} 2',
+        'test_seconds_bucket{stage="say \\"hi\\"",le="1"} 3',
+        'test_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 4',
+        'test_seconds_sum{stage="say \\"hi\\""} 3.650000',
+        'test_seconds_count{stage="say \\"hi\\""} 4',
+    ]
+
+def test_timed_records_even_when_the_call_raises():
+    histogram = app.LatencyHistogram("test_seconds", "Test", "stage")
+
+    @histogram.timed("boom")
+    def boom():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        boom()
+    assert histogram.render()[-1] == 'test_seconds_count{stage="boom"} 1'
+
+def test_metrics_endpoint_reports_requests():
+    client = app.app.test_client()
+    client.post("/api/analyze", json={"skills": ["Python", "SQL"]})
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.content_type == "text/plain; version=0.0.4; charset=utf-8"
+    types, samples = parse_metrics(response.get_data(as_text=True))
+    assert types["resume_pipeline_stage_seconds"] == "histogram"
+    assert types["cache_lookups_total"] == "counter"
+    for name, _, _ in samples:
+        assert name in types or re.sub(r"_(bucket|sum|count)$", "", name) in types
+
+    role_match = [
+        value for name, labels, value in samples
+        if name == "resume_pipeline_stage_seconds_bucket" and labels["stage"] == "role_match"
+    ]
+    assert role_match == sorted(role_match) and role_match[-1] >= 1
+    # The only request in flight is the /metrics request itself
+    assert ("http_requests_in_flight", {}, 1.0) in samples
+    ratios = {labels["cache"]: value for name, labels, value in samples if name == "cache_hit_ratio"}
+    assert set(ratios) == {"job", "resume"} and all(0 <= ratio <= 1 for ratio in ratios.values())
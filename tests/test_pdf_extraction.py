@@ -0,0 +1,42 @@
+import io
+import os
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+
+import app
+
+RESUME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Sai Ganesh Resume.pdf")
+
+@pytest.fixture(autouse=True)
+def empty_resume_cache():
+    app.RESUME_CACHE.clear()
+    yield
+    app.RESUME_CACHE.clear()
+
+def _resume_bytes(copies=1):
+    writer = PdfWriter()
+    for _ in range(copies):
+        for page in PdfReader(RESUME).pages:
+            writer.add_page(page)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+def test_pages_extracted_in_processes_match_in_thread(monkeypatch):
+    pdf = _resume_bytes(copies=3)
+    in_thread = app.extract_pdf_text(io.BytesIO(pdf))
+    monkeypatch.setattr(app, "PDF_EXTRACT_PROCESSES", 2)
+    assert app.extract_pdf_text(io.BytesIO(pdf)) == in_thread
+    assert in_thread[1] is True
+
+def test_text_cut_short_is_not_cached(monkeypatch):
+    pdf = _resume_bytes()
+    text, _ = app.extract_pdf_text(io.BytesIO(pdf))
+    monkeypatch.setattr(app, "extract_pdf_text", lambda stream: (text, False))
+    assert app.extract_skills_from_resume(pdf)
+    assert app.RESUME_CACHE.stats()["entries"] == 0
+
+    monkeypatch.setattr(app, "extract_pdf_text", lambda stream: (text, True))
+    assert app.extract_skills_from_resume(pdf)
+    assert app.RESUME_CACHE.stats()["entries"] == 1
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+import app
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "http")
+
+# Older and alternate layouts, matched only by each parser's fallback selectors
+FALLBACK_PAGES = {
+    "Internshala": b"""<html><body>
+        <div class="internship_meta"><div class="profile"><h3><a href="/internship/detail/data-analyst-1">Data Analyst</a></h3></div>
+            <p class="company_name">Orbit Analytics</p></div>
+        <div class="internship_meta"><div class="profile"><h3><a href="/internship/detail/ml-intern-2">ML Intern</a></h3></div>
+            <p class="company_name">Vector Labs</p></div>
+    </body></html>""",
+    "Naukri": b"""<html><body>
+        <div class="srp-jobtuple-wrapper"><div class="jobTupleHeader"><div class="title"><a href="/job-listings-sql-developer-1">SQL Developer</a></div></div>
+            <span class="comp-name">Ledger Systems</span></div>
+        <div class="srp-jobtuple-wrapper"><div class="jobTupleHeader"><div class="title"><a href="/job-listings-etl-engineer-2">ETL Engineer</a></div></div>
+            <span class="comp-name">Pipeline Works</span></div>
+    </body></html>""",
+    "Indeed": b"""<html><body>
+        <div class="job_seen_beacon"><h2 class="jobTitle"><a href="/viewjob?jk=1"><span>Backend Developer</span></a></h2>
+            <span data-testid="company-name">Northwind</span></div>
+        <div class="job_seen_beacon"><h2 class="jobTitle"><a href="/viewjob?jk=2"><span>Frontend Developer</span></a></h2>
+            <span data-testid="company-name">Contoso</span></div>
+    </body></html>""",
+}
+
+EXPECTED = {
+    "Internshala": [
+        ("Data Analyst", "Orbit Analytics", "https://internshala.com/internship/detail/data-analyst-1"),
+        ("ML Intern", "Vector Labs", "https://internshala.com/internship/detail/ml-intern-2"),
+    ],
+    # The link selector only knows the newer layout, so these fall back to the search page
+    "Naukri": [
+        ("SQL Developer", "Ledger Systems", "https://www.naukri.com/python"),
+        ("ETL Engineer", "Pipeline Works", "https://www.naukri.com/python"),
+    ],
+    "Indeed": [
+        ("Backend Developer", "Northwind", "https://in.indeed.com/viewjob?jk=1"),
+        ("Frontend Developer", "Contoso", "https://in.indeed.com/viewjob?jk=2"),
+    ],
+}
+
+@pytest.fixture(autouse=True)
+def fresh_selector_memory():
+    app.SELECTOR_MEMORY.clear()
+    yield
+    app.SELECTOR_MEMORY.clear()
+
+@pytest.mark.parametrize("portal", sorted(FALLBACK_PAGES))
+def test_fallback_selectors_parse_alternate_layout(portal):
+    parse_page = app.PORTAL_SCRAPERS[portal][2]
+    jobs = parse_page(FALLBACK_PAGES[portal], "python", None)
+    assert [(job["title"], job["company"], job["link"]) for job in jobs] == EXPECTED[portal]
+
+@pytest.mark.parametrize("portal", sorted(app.PORTAL_HOSTS))
+def test_fixture_page_parses_after_fallback_layout(portal):
+    parse_page = app.PORTAL_SCRAPERS[portal][2]
+    with open(os.path.join(FIXTURES_DIR, app.PORTAL_HOSTS[portal], "default.html"), "rb") as f:
+        page = f.read()
+    expected = parse_page(page, "python", None)
+    parse_page(FALLBACK_PAGES[portal], "python", None)
+    assert parse_page(page, "python", None) == expected
+    assert all(job["company"] and job["link"] for job in expected)
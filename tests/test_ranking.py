@@ -0,0 +1,13 @@
+import app
+
+def test_term_counts_are_whole_word_occurrences():
+    text = "python developer, python and sql. pythonic tools; sql server, javascript and javascript"
+    assert app.count_skills_in_text(text) == {"Python": 2, "SQL": 2, "JavaScript": 2}
+
+def test_rank_jobs_prefers_more_mentions_of_the_top_skill():
+    jobs = [
+        {"title": "Developer", "desc": "Python and SQL work on a small data team"},
+        {"title": "Python Developer", "desc": "Python services, Python tooling and SQL"},
+    ]
+    ranked = app.rank_jobs(jobs, ["Python", "SQL"])
+    assert [job["title"] for job in ranked] == ["Python Developer", "Developer"]
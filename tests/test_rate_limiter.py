@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+import app
+
+URL = "https://www.naukri.com/python-jobs"
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock the test moves by hand"""
+    now = [1000.0]
+    monkeypatch.setattr(app.time, "monotonic", lambda: now[0])
+    return now
+
+def test_burst_then_waits_for_refill(clock):
+    limiter = app.HostRateLimiter(2.0, 0.5, 8.0, 2)
+    assert limiter.reserve(URL) == 0.0
+    assert limiter.reserve(URL) == 0.0
+    # Bucket empty: the next slot is half a second away at 2/s, the one after a full second
+    assert limiter.reserve(URL) == pytest.approx(0.5)
+    assert limiter.reserve(URL) == pytest.approx(1.0)
+    assert limiter.reserve(URL, max_wait=1.0) is None
+
+    clock[0] += 1.0
+    assert limiter.reserve(URL) == pytest.approx(0.5)
+
+def test_hosts_have_separate_buckets(clock):
+    limiter = app.HostRateLimiter(1.0, 0.5, 8.0, 1)
+    assert limiter.reserve(URL) == 0.0
+    assert limiter.reserve("https://in.indeed.com/jobs?q=python") == 0.0
+    assert limiter.reserve(URL) == pytest.approx(1.0)
+
+def test_additive_increase_multiplicative_decrease(clock):
+    limiter = app.HostRateLimiter(1.0, 0.5, 1.25, 1, increase=0.1, decrease=0.5)
+    limiter.succeeded(URL)
+    limiter.succeeded(URL)
+    assert limiter.stats()["www.naukri.com"]["rate_per_s"] == pytest.approx(1.2)
+    limiter.succeeded(URL)
+    assert limiter.stats()["www.naukri.com"]["rate_per_s"] == 1.25
+
+    limiter.throttled(URL)
+    assert limiter.stats()["www.naukri.com"]["rate_per_s"] == pytest.approx(0.625)
+    limiter.throttled(URL)
+    limiter.throttled(URL)
+    assert limiter.stats()["www.naukri.com"] == {"rate_per_s": 0.5, "blocked_for_s": 0.0, "throttled": 3}
+
+def test_retry_after_blocks_the_host(clock):
+    limiter = app.HostRateLimiter(4.0, 0.5, 8.0, 4)
+    limiter.throttled(URL, retry_after=10)
+    assert limiter.stats()["www.naukri.com"]["blocked_for_s"] == 10.0
+    assert limiter.reserve(URL, max_wait=5) is None
+    assert limiter.reserve(URL) == pytest.approx(10.0)
+
+def test_zero_rate_is_unlimited():
+    limiter = app.HostRateLimiter(0, 0, 0, 0)
+    assert all(limiter.reserve(URL) == 0.0 for _ in range(100))
+    limiter.release(URL)
+    assert limiter.stats() == {}
+
+def test_cancelled_wait_returns_the_slot(monkeypatch):
+    limiter = app.HostRateLimiter(0.5, 0.1, 1.0, 1)
+    monkeypatch.setattr(app, "HOST_RATE_LIMITER", limiter)
+    monkeypatch.setattr(app, "PORTAL_BREAKERS", {})
+    limiter.reserve(URL)
+
+    async def cancel_while_waiting():
+        task = asyncio.ensure_future(app.safe_request_async(URL))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_while_waiting())
+    # Only the slot taken above is still out, so the next one is about 2s away, not 4s
+    assert limiter.reserve(URL) == pytest.approx(2.0, abs=0.2)
+
+def test_run_async_closes_the_loops_http_client():
+    pytest.importorskip("httpx")
+
+    async def open_client():
+        return app.get_async_http_client()
+
+    client = app.run_async(open_client())
+    assert client.is_closed
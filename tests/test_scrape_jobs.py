@@ -0,0 +1,19 @@
+import asyncio
+
+import app
+
+def test_background_scrape_on_event_loop_completes():
+    registry = app.ScrapeJobRegistry(1, 60)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        job_id = await asyncio.to_thread(registry.submit, ["Python", "SQL"], 10, loop=loop)
+        while registry.get(job_id)["status"] == "running":
+            await asyncio.sleep(0.05)
+        return registry.get(job_id)
+
+    app.JOB_CACHE.clear()
+    state = asyncio.run(run())
+    assert state["status"] == "completed"
+    assert sorted(state["portals_completed"]) == sorted(app.PORTAL_SCRAPERS)
+    assert state["jobs_count"] == len(state["job_listings"]) > 0
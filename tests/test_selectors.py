@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+import app
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "http")
+
+ODD_NAUKRI_PAGE = b'<html><body><div class="jobCard"><h3><a href="/x">Odd Layout Developer</a></h3></div></body></html>'
+
+@pytest.fixture(autouse=True)
+def fresh_selector_memory():
+    app.SELECTOR_MEMORY.clear()
+    yield
+    app.SELECTOR_MEMORY.clear()
+
+def _naukri_titles(page):
+    return [job["title"] for job in app._parse_naukri_page(page, "python jobs", 15)]
+
+def test_catch_all_match_does_not_stick():
+    with open(os.path.join(FIXTURES_DIR, "www.naukri.com", "default.html"), "rb") as f:
+        normal = f.read()
+    expected = _naukri_titles(normal)
+
+    assert _naukri_titles(ODD_NAUKRI_PAGE) == ["Odd Layout Developer"]
+    assert app.SELECTOR_MEMORY.stats().get("Naukri.cards") is None
+    assert _naukri_titles(normal) == expected
+
+def test_first_choice_selector_is_rechecked():
+    memory = app.SelectorMemory()
+    selectors = ["a.title", "h3 a", "a"]
+    memory.remember("Naukri", "title", "h3 a")
+    assert memory.ordered("Naukri", "title", selectors) == ["a.title", "h3 a", "a"]
+
+    memory.remember("Naukri", "title", "a")
+    assert memory.ordered("Naukri", "title", selectors) == ["a.title", "a", "h3 a"]
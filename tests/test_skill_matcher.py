@@ -0,0 +1,62 @@
+import os
+import re
+import random
+
+import pytest
+from PyPDF2 import PdfReader
+
+import app
+
+RESUME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Sai Ganesh Resume.pdf")
+
+def baseline_scores(text_lower):
+    """The per-skill regex loop extraction used before the single-pass matcher"""
+    skill_matches = {}
+    for skill in app.ALL_SKILLS:
+        skill_lower = skill.lower()
+        match_count = 0
+        exact_matches = len(re.findall(rf'\b{re.escape(skill_lower)}\b', text_lower))
+        if exact_matches > 0:
+            match_count += exact_matches * 3
+        if skill_lower in text_lower:
+            match_count += 1
+        variations = []
+        if '.' in skill_lower:
+            variations.append(skill_lower.replace('.', ''))
+        if ' ' in skill_lower:
+            variations.append(skill_lower.replace(' ', ''))
+        if '-' in skill_lower:
+            variations.append(skill_lower.replace('-', ''))
+        for variation in variations:
+            if variation in text_lower:
+                match_count += 1
+        for abbrev in app.SKILL_ABBREVIATIONS.get(skill_lower, []):
+            if f'\\b{abbrev}\\b' in text_lower:
+                match_count += 2
+        if match_count >= 2:
+            skill_matches[skill] = match_count
+    return skill_matches
+
+def _texts():
+    reader = PdfReader(RESUME)
+    resume = re.sub(r'\s+', ' ', " ".join(page.extract_text() or "" for page in reader.pages)).lower()
+    texts = [
+        resume,
+        "vue.js frontend",
+        "node.js, next.js and express.js apis with js tooling",
+        "ml and ai research; ui/ux design; rest api; sql, mysql and postgresql",
+        "c++ c# c python3 java javascript typescript ts js golang go",
+        "machine-learning machinelearning machine learning \\bml\\b \\bjs\\b",
+        "react.js reactjs react-native react native (react) [docker]/kubernetes",
+    ]
+    rng = random.Random(1)
+    separators = [" ", ", ", ".", "/", "-", "(", ") ", "_", ""]
+    skills = [skill.lower() for skill in app.ALL_SKILLS] + ["js", "ts", "ml", "ai", "api", "ui", "ux"]
+    for _ in range(50):
+        words = [rng.choice(skills + ["and", "with", "developer", "x"]) for _ in range(60)]
+        texts.append("".join(word + rng.choice(separators) for word in words))
+    return texts
+
+@pytest.mark.parametrize("text", _texts())
+def test_matcher_scores_match_baseline(text):
+    assert app.score_skills_in_text(text) == baseline_scores(text)
@@ -0,0 +1,45 @@
+import pytest
+
+import app
+
+@pytest.mark.parametrize("name, expected", [
+    ("Python", "Python"),
+    ("  PYTHON ", "Python"),
+    ("r", "R"),
+    ("nodejs", "Node.js"),
+    ("Node", "Node.js"),
+    ("react.js", "React"),
+    ("K8s", "Kubernetes"),
+    ("c sharp", "C#"),
+    ("golang", "Go"),
+    ("js", "JavaScript"),
+    ("ML", "Machine Learning"),
+    ("Unknown Skill", None),
+    ("", None),
+    (5, None),
+    (None, None),
+])
+def test_canonical_skill(name, expected):
+    assert app.canonical_skill(name) == expected
+
+def test_every_alias_names_a_known_skill():
+    assert set(app.SKILL_ALIASES.values()) <= set(app.ALL_SKILLS)
+
+def test_real_skill_names_are_never_aliased_away():
+    for skill in app.ALL_SKILLS:
+        assert app.canonical_skill(skill.lower()) == skill
+
+def test_canonicalize_skills_drops_unknown_and_duplicates_in_order():
+    assert app.canonicalize_skills(["postgres", "Python", "nodejs", "python", "PostgreSQL", "???", 3, "Node.js"]) == [
+        "PostgreSQL", "Python", "Node.js"
+    ]
+
+def test_skill_in_several_categories_belongs_to_the_first():
+    assert "Swift" in app.MOBILE_TECHNOLOGIES
+    assert app.SKILL_CATEGORY["Swift"] == "Programming Languages"
+    assert all(skill in app.SKILL_CATEGORY for skill in app.ALL_SKILLS)
+
+def test_analyze_accepts_aliases():
+    response = app.app.test_client().post("/api/analyze", json={"skills": ["nodejs", "Postgres", "k8s", "NODE"]})
+    assert response.status_code == 200
+    assert response.get_json()["skills"] == ["Node.js", "PostgreSQL", "Kubernetes"]